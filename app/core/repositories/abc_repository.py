@@ -1,12 +1,15 @@
 import abc
 import uuid
-from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from pydantic import BaseModel
 
 AnyModel = Dict[str, Any]
 Entity = BaseModel
 FindAllResult = Tuple[int, List[Entity]]
+VersionResult = Tuple[int, Optional[datetime]]
+Fields = Optional[Sequence[str]]
 
 
 class AbstractRepository(abc.ABC):
@@ -38,14 +41,20 @@ class AbstractRepository(abc.ABC):
 
     @abc.abstractmethod
     async def find_all_pg(
-        self, filter_by: AnyModel, limit: int, page: int
+        self, filter_by: AnyModel, limit: int, page: int, fields: Fields = None
     ) -> FindAllResult:
         """Найти все сущности с пагинацией."""
 
     @abc.abstractmethod
-    async def find_all(self, filter_by: AnyModel) -> FindAllResult:
+    async def find_all(
+        self, filter_by: AnyModel, fields: Fields = None
+    ) -> FindAllResult:
         """Найти все сущности с пагинацией."""
 
+    @abc.abstractmethod
+    async def get_version(self, filter_by: AnyModel) -> VersionResult:
+        """Получить количество и время последнего изменения сущностей."""
+
     @abc.abstractmethod
     async def delete_with_id(self, uuid: uuid.UUID) -> bool:
         """Удалить сущность по UUID."""
@@ -6,8 +6,12 @@ from app.core.repositories.abc_repository import AbstractRepository
 class AbstractUnitOfWork(abc.ABC):
     """Абстрактный класс UOW."""
 
-    leads: AbstractRepository
-    lead_photos: AbstractRepository
+    users: AbstractRepository
+    habits: AbstractRepository
+    habit_logs: AbstractRepository
+    habit_daily_stats: AbstractRepository
+    tombstones: AbstractRepository
+    login_directory: AbstractRepository
 
     @abc.abstractmethod
     async def __aenter__(self):
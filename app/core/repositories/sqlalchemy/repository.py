@@ -1,8 +1,8 @@
 import uuid
-from typing import Any, List, Optional, Type
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple, Type
 
-from pydantic import BaseModel
-from sqlalchemy import delete, func, insert, select, update
+from pydantic import BaseModel, create_model
+from sqlalchemy import bindparam, delete, func, insert, select, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -13,7 +13,9 @@ from app.core.repositories.abc_repository import (
     AbstractRepository,
     AnyModel,
     Entity,
+    Fields,
     FindAllResult,
+    VersionResult,
 )
 
 
@@ -23,6 +25,12 @@ class SQLAlchemyRepository(AbstractRepository):
     Позволяет взаимодействовать с моделью базы данных с использованием асинхронных сессий.
     """
 
+    _partial_schemas: ClassVar[
+        Dict[Tuple[type, Tuple[str, ...]], Type[BaseModel]]
+    ] = {}
+    # Шаблоны запросов с bind-параметрами: (модель, тип запроса, ключи) -> запрос
+    _statements: ClassVar[Dict[Tuple[Any, ...], Any]] = {}
+
     def __init__(
         self,
         session: AsyncSession,
@@ -92,8 +100,17 @@ class SQLAlchemyRepository(AbstractRepository):
         :param data: Данные для обновления.
         :return: True при успешном обновлении, иначе ошибка.
         """
-        stmt = update(self.model).where(self.model.uuid == uuid).values(**data)
-        result = await self.session.execute(stmt)
+        keys = tuple(sorted(data))
+        stmt = self.cached_statement(
+            "edit_one",
+            keys,
+            lambda: update(self.model)
+            .where(self.model.uuid == bindparam("pk"))
+            .values({key: bindparam(f"v_{key}") for key in keys})
+            .execution_options(synchronize_session=False),
+        )
+        params = {f"v_{key}": value for key, value in data.items()}
+        result = await self.session.execute(stmt, {"pk": uuid, **params})
         if result.rowcount == 0:
             raise exc.NotFoundError(f"{self.name} не найден")
         return True
@@ -105,8 +122,13 @@ class SQLAlchemyRepository(AbstractRepository):
         :param filter_by: Фильтр для поиска.
         :return: Экземпляр модели или None, если запись не найдена.
         """
-        stmt = select(self.model).filter_by(**filter_by)
-        result = await self.session.execute(stmt)
+        keys = self.filter_keys(filter_by)
+        stmt = self.cached_statement(
+            "find_one",
+            keys,
+            lambda: select(self.model).where(*self.filter_criteria(keys)),
+        )
+        result = await self.session.execute(stmt, self.filter_params(filter_by))
         instance = result.scalar_one_or_none()
         if not instance:
             raise exc.NotFoundError()
@@ -124,40 +146,83 @@ class SQLAlchemyRepository(AbstractRepository):
         instances = result.scalars().all()
         return [self.to_read_model(instance) for instance in instances]
 
-    async def find_all(self, filter_by: AnyModel) -> FindAllResult:
+    async def find_all(
+        self, filter_by: AnyModel, fields: Fields = None
+    ) -> FindAllResult:
         """
         Ищет все записи по фильтру.
 
         :param filter_by: Фильтр для поиска.
+        :param fields: Загружаемые поля; если не указаны, загружается вся запись.
         :return: Общее количество записей и список сущностей.
         """
-        stmt = select(self.model).filter_by(**filter_by)
-        count_stmt = select(func.count(self.model.uuid)).filter_by(**filter_by)
+        fields = self.normalize_fields(fields)
+        keys = self.filter_keys(filter_by)
+        stmt = self.cached_statement(
+            "find_all",
+            (keys, fields),
+            lambda: self.select_fields(fields).where(*self.filter_criteria(keys)),
+        )
+        params = self.filter_params(filter_by)
 
-        total_count = (await self.session.execute(count_stmt)).scalar_one()
-        result = await self.session.execute(stmt)
-        instances = result.scalars().all()
-        return total_count, [self.to_read_model(instance) for instance in instances]
+        total_count = (
+            await self.session.execute(self.count_statement(keys), params)
+        ).scalar_one()
+        result = await self.session.execute(stmt, params)
+        return total_count, self.to_read_models(result, fields)
 
     async def find_all_pg(
-        self, filter_by: AnyModel, limit: int, page: int
+        self, filter_by: AnyModel, limit: int, page: int, fields: Fields = None
     ) -> FindAllResult:
         """
-        Пагинированный поиск записей по фильтру.
+        Пагинированный поиск записей по фильтру в порядке `(created_at, uuid)`.
 
         :param filter_by: Фильтр для поиска.
         :param limit: Лимит на количество записей.
         :param page: Номер страницы.
+        :param fields: Загружаемые поля; если не указаны, загружается вся запись.
         :return: Общее количество записей и список сущностей.
         """
         offset = (page - 1) * limit
-        stmt = select(self.model).filter_by(**filter_by).limit(limit).offset(offset)
-        count_stmt = select(func.count(self.model.uuid)).filter_by(**filter_by)
+        fields = self.normalize_fields(fields)
+        keys = self.filter_keys(filter_by)
+        stmt = self.cached_statement(
+            "find_all_pg",
+            (keys, fields),
+            lambda: self.select_fields(fields)
+            .where(*self.filter_criteria(keys))
+            .order_by(self.model.created_at, self.model.uuid)
+            .limit(bindparam("limit"))
+            .offset(bindparam("offset")),
+        )
+        params = self.filter_params(filter_by)
 
-        total_count = (await self.session.execute(count_stmt)).scalar_one()
-        result = await self.session.execute(stmt)
-        instances = result.scalars().all()
-        return total_count, [self.to_read_model(instance) for instance in instances]
+        total_count = (
+            await self.session.execute(self.count_statement(keys), params)
+        ).scalar_one()
+        result = await self.session.execute(
+            stmt, {**params, "limit": limit, "offset": offset}
+        )
+        return total_count, self.to_read_models(result, fields)
+
+    async def get_version(self, filter_by: AnyModel) -> VersionResult:
+        """
+        Лёгкий запрос версии набора записей без загрузки самих записей.
+
+        :param filter_by: Фильтр для поиска.
+        :return: Количество записей и максимальное значение `updated_at`.
+        """
+        keys = self.filter_keys(filter_by)
+        stmt = self.cached_statement(
+            "get_version",
+            keys,
+            lambda: select(
+                func.count(self.model.uuid), func.max(self.model.updated_at)
+            ).where(*self.filter_criteria(keys)),
+        )
+        result = await self.session.execute(stmt, self.filter_params(filter_by))
+        count, last_modified = result.one()
+        return count, last_modified
 
     async def delete_with_id(self, uuid: uuid.UUID) -> bool:
         """
@@ -166,12 +231,91 @@ class SQLAlchemyRepository(AbstractRepository):
         :param uuid: UUID записи для удаления.
         :return: True при успешном удалении, иначе ошибка.
         """
-        stmt = delete(self.model).where(self.model.uuid == uuid)
-        result = await self.session.execute(stmt)
+        stmt = self.cached_statement(
+            "delete_with_id",
+            (),
+            lambda: delete(self.model)
+            .where(self.model.uuid == bindparam("pk"))
+            .execution_options(synchronize_session=False),
+        )
+        result = await self.session.execute(stmt, {"pk": uuid})
         if result.rowcount == 0:
             raise exc.NotFoundError(f"{self.name} не найден")
         return True
 
+    def cached_statement(self, name: str, key: Any, build: Callable[[], Any]) -> Any:
+        """
+        Возвращает шаблон запроса из кэша, при первом обращении строя его.
+
+        Значения передаются в шаблон через bind-параметры при выполнении,
+        поэтому один шаблон переиспользуется для всех запросов с тем же
+        набором ключей, а SQLAlchemy не строит запрос и ключ кэша компиляции
+        заново.
+
+        :param name: Тип запроса.
+        :param key: Набор ключей, определяющих форму запроса.
+        :param build: Функция построения запроса.
+        :return: Шаблон запроса.
+        """
+        cache_key = (self.model, name, key)
+        stmt = self._statements.get(cache_key)
+        if stmt is None:
+            stmt = self._statements[cache_key] = build()
+        return stmt
+
+    def count_statement(self, keys: Tuple[Tuple[str, bool], ...]) -> Any:
+        """
+        Шаблон запроса количества записей по фильтру.
+
+        :param keys: Ключи фильтра.
+        :return: Шаблон запроса.
+        """
+        return self.cached_statement(
+            "count",
+            keys,
+            lambda: select(func.count(self.model.uuid)).where(
+                *self.filter_criteria(keys)
+            ),
+        )
+
+    @staticmethod
+    def filter_keys(filter_by: AnyModel) -> Tuple[Tuple[str, bool], ...]:
+        """
+        Форма фильтра: имена полей и признак сравнения с NULL.
+
+        :param filter_by: Фильтр для поиска.
+        :return: Отсортированный кортеж пар (поле, значение is None).
+        """
+        return tuple((key, filter_by[key] is None) for key in sorted(filter_by))
+
+    def filter_criteria(self, keys: Tuple[Tuple[str, bool], ...]) -> List[Any]:
+        """
+        Условия WHERE с bind-параметрами для формы фильтра.
+
+        :param keys: Ключи фильтра.
+        :return: Список условий.
+        """
+        return [
+            (
+                getattr(self.model, key).is_(None)
+                if is_null
+                else getattr(self.model, key) == bindparam(f"f_{key}")
+            )
+            for key, is_null in keys
+        ]
+
+    @staticmethod
+    def filter_params(filter_by: AnyModel) -> Dict[str, Any]:
+        """
+        Значения bind-параметров для фильтра.
+
+        :param filter_by: Фильтр для поиска.
+        :return: Словарь параметров.
+        """
+        return {
+            f"f_{key}": value for key, value in filter_by.items() if value is not None
+        }
+
     def to_read_model(self, obj: Any) -> Entity:
         """
         Преобразует ORM объект в модель pydantic для сериализации.
@@ -183,6 +327,76 @@ class SQLAlchemyRepository(AbstractRepository):
             return self.schema.model_validate(obj, from_attributes=True)
         return obj
 
+    def normalize_fields(self, fields: Fields) -> Optional[Tuple[str, ...]]:
+        """
+        Проверяет запрошенные поля и упорядочивает их как в схеме.
+
+        Допускаются только колонки модели, присутствующие в схеме, чтобы
+        выборка не открывала поля, скрытые схемой.
+
+        :param fields: Запрошенные поля; пустые имена игнорируются.
+        :return: Кортеж полей или None, если нужна вся запись.
+        :raises BadRequestException: Если запрошено неизвестное поле.
+        """
+        fields = {name.strip() for name in fields or () if name.strip()}
+        if not fields:
+            return None
+        allowed = list(self.model.__table__.columns.keys())
+        if self.schema:
+            allowed = [name for name in self.schema.model_fields if name in allowed]
+        unknown = set(fields) - set(allowed)
+        if unknown:
+            raise exc.BadRequestException(
+                f"Неизвестные поля: {', '.join(sorted(unknown))}."
+            )
+        return tuple(name for name in allowed if name in fields)
+
+    def select_fields(self, fields: Optional[Tuple[str, ...]]):
+        """
+        Строит select только по нужным колонкам.
+
+        :param fields: Нормализованные поля или None для всей записи.
+        :return: Выражение select.
+        """
+        if fields is None:
+            return select(self.model)
+        return select(*(getattr(self.model, name) for name in fields))
+
+    def to_read_models(
+        self, result: Any, fields: Optional[Tuple[str, ...]]
+    ) -> List[Entity]:
+        """
+        Преобразует результат select в список сущностей.
+
+        :param result: Результат выполнения запроса.
+        :param fields: Нормализованные поля или None для всей записи.
+        :return: Список сущностей (для частичной выборки — по урезанной схеме).
+        """
+        if fields is None:
+            return [self.to_read_model(instance) for instance in result.scalars()]
+        if not self.schema:
+            return [dict(row) for row in result.mappings()]
+        schema = self.partial_schema(fields)
+        return [schema.model_validate(dict(row)) for row in result.mappings()]
+
+    def partial_schema(self, fields: Tuple[str, ...]) -> Type[BaseModel]:
+        """
+        Возвращает (и кэширует) урезанную до указанных полей pydantic-схему.
+
+        :param fields: Нормализованные поля.
+        :return: Pydantic-схема с подмножеством полей.
+        """
+        key = (self.schema, fields)
+        if key not in self._partial_schemas:
+            self._partial_schemas[key] = create_model(
+                f"{self.schema.__name__}Partial",
+                **{
+                    name: (self.schema.model_fields[name].annotation, ...)
+                    for name in fields
+                },
+            )
+        return self._partial_schemas[key]
+
     def handle_integrity_error(self, e: IntegrityError) -> None:
         """
         Обрабатывает ошибки целостности данных (например, нарушение уникальности).
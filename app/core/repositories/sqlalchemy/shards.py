@@ -0,0 +1,145 @@
+import asyncio
+import bisect
+import hashlib
+import uuid
+from typing import Awaitable, Callable, List, Sequence, Tuple, TypeVar
+
+from sqlalchemy import NullPool
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.core.repositories.sqlalchemy.uow import UnitOfWork
+from app.core.settings import settings
+
+T = TypeVar("T")
+
+
+class ShardRouter:
+    """Маршрутизация пользователей по шардам Postgres.
+
+    UUID пользователя отображается на шард консистентным хешированием с
+    виртуальными узлами: при добавлении шарда переезжает лишь ~1/N
+    пользователей. Узлы кольца привязаны к порядковому номеру шарда,
+    поэтому смена адреса БД не меняет распределение.
+
+    Глобальный справочник логинов хранится на шарде `DIRECTORY_SHARD`;
+    новые шарды добавляются в конец списка, поэтому его номер не меняется.
+    """
+
+    DIRECTORY_SHARD = 0
+
+    def __init__(
+        self,
+        engines: Sequence[AsyncEngine],
+        virtual_nodes: int = settings.shard_virtual_nodes,
+    ):
+        """
+        Инициализация маршрутизатора.
+
+        :param engines: Движки шардов; порядок определяет номера шардов.
+        :param virtual_nodes: Количество виртуальных узлов на шард.
+        """
+        self.engines = list(engines)
+        self.session_makers = [
+            async_sessionmaker(engine, expire_on_commit=False)
+            for engine in self.engines
+        ]
+        self._ring: List[Tuple[int, int]] = sorted(
+            (self._hash(f"shard-{shard}-{node}"), shard)
+            for shard in range(len(self.engines))
+            for node in range(virtual_nodes)
+        )
+        self._ring_keys = [point for point, _ in self._ring]
+
+    @classmethod
+    def from_settings(cls) -> "ShardRouter":
+        """
+        Создаёт маршрутизатор по настройкам приложения.
+
+        Если список шардов не задан, используется единственная БД.
+
+        :return: Маршрутизатор шардов.
+        """
+        if settings.mode == "prod":
+            urls = settings.shard_urls
+            options = settings.engine_options
+        else:
+            urls = settings.test_shard_urls
+            options = {**settings.engine_options, "poolclass": NullPool}
+        return cls([create_async_engine(url, **options) for url in urls])
+
+    @property
+    def shards_count(self) -> int:
+        """Количество шардов."""
+        return len(self.engines)
+
+    def shard_for(self, user_id: uuid.UUID) -> int:
+        """
+        Возвращает номер шарда пользователя.
+
+        :param user_id: UUID пользователя.
+        :return: Номер шарда.
+        """
+        index = bisect.bisect(self._ring_keys, self._hash(str(user_id)))
+        return self._ring[index % len(self._ring)][1]
+
+    def session_maker_for(self, user_id: uuid.UUID) -> async_sessionmaker:
+        """
+        Возвращает фабрику сессий шарда пользователя.
+
+        :param user_id: UUID пользователя.
+        :return: Фабрика асинхронных сессий.
+        """
+        return self.session_makers[self.shard_for(user_id)]
+
+    def uow_for(self, user_id: uuid.UUID) -> UnitOfWork:
+        """
+        Создаёт Unit of Work на шарде пользователя.
+
+        :param user_id: UUID пользователя.
+        :return: Unit of Work.
+        """
+        return self.uow_for_shard(self.shard_for(user_id))
+
+    def uow_for_shard(self, shard: int) -> UnitOfWork:
+        """
+        Создаёт Unit of Work на шарде с указанным номером.
+
+        :param shard: Номер шарда.
+        :return: Unit of Work.
+        """
+        return UnitOfWork(self.session_makers[shard])
+
+    def directory_uow(self) -> UnitOfWork:
+        """
+        Создаёт Unit of Work на шарде справочника логинов.
+
+        :return: Unit of Work.
+        """
+        return self.uow_for_shard(self.DIRECTORY_SHARD)
+
+    async def fan_out(self, query: Callable[[UnitOfWork], Awaitable[T]]) -> List[T]:
+        """
+        Выполняет запрос на всех шардах параллельно (для административных
+        и межпользовательских чтений).
+
+        :param query: Корутина, получающая Unit of Work шарда.
+        :return: Результаты в порядке номеров шардов.
+        """
+
+        async def run(shard: int) -> T:
+            uow = self.uow_for_shard(shard)
+            async with uow:
+                return await query(uow)
+
+        return list(await asyncio.gather(*map(run, range(self.shards_count))))
+
+    async def dispose(self) -> None:
+        """Закрывает пулы соединений всех шардов."""
+        await asyncio.gather(*(engine.dispose() for engine in self.engines))
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        """Стабильный 64-битный хеш строки."""
+        return int.from_bytes(
+            hashlib.blake2b(value.encode(), digest_size=8).digest(), "big"
+        )
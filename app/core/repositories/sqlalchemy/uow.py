@@ -1,15 +1,15 @@
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from app.core.repositories.abc_uow import AbstractUnitOfWork
-from app.core.settings import settings
-from app.online_loan.repositories.sqlalchemy.repositories import (
-    LeadPhotosRepository,
-    LeadsRepository,
+from app.habit_tracker.repositories.sqlalchemy.repositories import (
+    HabitDailyStatsRepository,
+    HabitLogsRepository,
+    HabitsRepository,
+    LoginDirectoryRepository,
+    TombstonesRepository,
+    UsersRepository,
 )
 
-engine = create_async_engine(settings.database_url)
-pg_async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
-
 
 class UnitOfWork(AbstractUnitOfWork):
     """Realization UnitOfWork."""
@@ -20,8 +20,12 @@ class UnitOfWork(AbstractUnitOfWork):
 
     async def __aenter__(self):
         """Асинхронны вход в сессию."""
-        self.leads = LeadsRepository(self.session)
-        self.lead_photos = LeadPhotosRepository(self.session)
+        self.users = UsersRepository(self.session)
+        self.habits = HabitsRepository(self.session)
+        self.habit_logs = HabitLogsRepository(self.session)
+        self.habit_daily_stats = HabitDailyStatsRepository(self.session)
+        self.tombstones = TombstonesRepository(self.session)
+        self.login_directory = LoginDirectoryRepository(self.session)
 
     async def __aexit__(self, *args):
         """Асинхронны выход из сессии."""
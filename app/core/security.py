@@ -0,0 +1,133 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+
+class PasswordHasher:
+    """Хеширование паролей алгоритмом scrypt вне цикла событий.
+
+    Хеширование и проверка выполняются в ограниченном пуле потоков:
+    `hashlib.scrypt` отпускает GIL, поэтому пропускная способность
+    масштабируется по ядрам, а цикл событий не блокируется.
+    Хеш хранится в формате `scrypt$n$r$p$salt$hash`.
+    """
+
+    algorithm = "scrypt"
+
+    def __init__(
+        self,
+        n: int = 2**14,
+        r: int = 8,
+        p: int = 1,
+        max_workers: Optional[int] = None,
+        salt_size: int = 16,
+        key_size: int = 32,
+    ):
+        """
+        Инициализация хешера.
+
+        :param n: Параметр стоимости scrypt (степень двойки).
+        :param r: Размер блока scrypt.
+        :param p: Параметр параллелизма scrypt.
+        :param max_workers: Размер пула потоков; по умолчанию — число ядер.
+        :param salt_size: Размер соли в байтах.
+        :param key_size: Размер хеша в байтах.
+        """
+        self.n = n
+        self.r = r
+        self.p = p
+        self.salt_size = salt_size
+        self.key_size = key_size
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or os.cpu_count() or 1,
+            thread_name_prefix="password-hasher",
+        )
+
+    async def hash(self, password: str) -> str:
+        """
+        Хеширует пароль с текущими параметрами стоимости.
+
+        :param password: Пароль.
+        :return: Строка хеша.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """
+        Проверяет пароль по сохранённому хешу.
+
+        :param password: Пароль.
+        :param hashed_password: Сохранённый хеш.
+        :return: True, если пароль верный.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, self._verify, password, hashed_password
+        )
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """
+        Проверяет, создан ли хеш с устаревшими параметрами стоимости.
+
+        :param hashed_password: Сохранённый хеш.
+        :return: True, если хеш нужно пересчитать.
+        """
+        try:
+            algorithm, n, r, p, _, _ = hashed_password.split("$")
+            return algorithm != self.algorithm or (int(n), int(r), int(p)) != (
+                self.n,
+                self.r,
+                self.p,
+            )
+        except ValueError:
+            return True
+
+    def shutdown(self) -> None:
+        """Останавливает пул потоков."""
+        self.executor.shutdown(wait=True)
+
+    def _hash(self, password: str) -> str:
+        """Синхронное хеширование пароля."""
+        salt = os.urandom(self.salt_size)
+        key = self._derive(password, salt, self.n, self.r, self.p)
+        return "$".join(
+            [
+                self.algorithm,
+                str(self.n),
+                str(self.r),
+                str(self.p),
+                base64.b64encode(salt).decode(),
+                base64.b64encode(key).decode(),
+            ]
+        )
+
+    def _verify(self, password: str, hashed_password: str) -> bool:
+        """Синхронная проверка пароля."""
+        try:
+            algorithm, n, r, p, salt, key = hashed_password.split("$")
+            if algorithm != self.algorithm:
+                return False
+            expected = base64.b64decode(key)
+            actual = self._derive(
+                password, base64.b64decode(salt), int(n), int(r), int(p)
+            )
+        except ValueError:
+            return False
+        return hmac.compare_digest(actual, expected)
+
+    def _derive(self, password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+        """Вычисляет ключ scrypt."""
+        return hashlib.scrypt(
+            password.encode(),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            maxmem=256 * n * r * p,
+            dklen=self.key_size,
+        )
@@ -25,6 +25,41 @@ class Settings(BaseSettings):
     test_database_port: int
     test_database_name: str
 
+    # Шарды: список URL БД (JSON-массив в переменной окружения);
+    # если не задан, используется единственная БД выше
+    database_shards: list[str] = []
+    test_database_shards: list[str] = []
+    shard_virtual_nodes: int = 160
+
+    # Кэши запросов: компилированных SQLAlchemy и подготовленных asyncpg
+    db_query_cache_size: int = 1200
+    db_prepared_statement_cache_size: int = 500
+
+    # Авторизация
+    access_token_expire_minutes: int = 30
+    password_hash_workers: int | None = None  # по умолчанию — число ядер
+    password_scrypt_n: int = 2**14
+    password_scrypt_r: int = 8
+    password_scrypt_p: int = 1
+
+    # Сжатие ответов больше этого размера (байт)
+    gzip_minimum_size: int = 1024
+
+    # Буфер отложенной записи количественных отметок
+    write_buffer_enabled: bool = True
+    write_buffer_flush_interval_ms: int = 500
+    write_buffer_max_items: int = 1000
+    write_buffer_max_pending: int = 10000
+    write_buffer_max_attempts: int = 5
+
+    # Дельта-синхронизация: записи моложе этого интервала не отдаются;
+    # должен превышать длительность самой долгой пишущей транзакции
+    sync_safety_lag_seconds: int = 30
+
+    # Пересчёт дневных агрегатов
+    rollup_batch_size: int = 500
+    rollup_concurrency: int = 4
+
     @property
     def database_url(self):
         """Url database."""
@@ -33,6 +68,26 @@ class Settings(BaseSettings):
             f"{self.database_port}/{self.database_name}"
         )
 
+    @property
+    def shard_urls(self) -> list[str]:
+        """Url databases of shards in shard order."""
+        return self.database_shards or [self.database_url]
+
+    @property
+    def test_shard_urls(self) -> list[str]:
+        """Url test databases of shards in shard order."""
+        return self.test_database_shards or [self.test_database_url]
+
+    @property
+    def engine_options(self) -> dict:
+        """Options for create_async_engine."""
+        return {
+            "query_cache_size": self.db_query_cache_size,
+            "connect_args": {
+                "prepared_statement_cache_size": self.db_prepared_statement_cache_size
+            },
+        }
+
     @property
     def test_database_url(self):
         """Url database."""
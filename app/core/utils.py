@@ -1,8 +1,10 @@
 import decimal
+import hashlib
 import re
 from dataclasses import dataclass
-from datetime import date, datetime, timedelta
-from typing import Dict, Optional, Union
+from datetime import UTC, date, datetime, timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional, Union
 
 import jwt
 
@@ -37,6 +39,67 @@ class MockResponse:
         self.status = expected_response_status
 
 
+@dataclass
+class Validators:
+    """Валидаторы условного GET-запроса (ETag и Last-Modified)."""
+
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    @classmethod
+    def from_version(
+        cls, count: int, last_modified: Optional[datetime], *parts: Any
+    ) -> "Validators":
+        """
+        Строит валидаторы по версии набора записей.
+
+        :param count: Количество записей.
+        :param last_modified: Максимальное время изменения записей.
+        :param parts: Дополнительные значения, влияющие на ответ (параметры запроса).
+        :return: Валидаторы ответа.
+        """
+        if last_modified is not None and last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=UTC)
+        stamp = last_modified.isoformat() if last_modified else ""
+        raw = "|".join(str(part) for part in (count, stamp, *parts))
+        digest = hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()
+        return cls(etag=f'W/"{digest}"', last_modified=last_modified)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Заголовки ответа с валидаторами."""
+        headers = {"ETag": self.etag, "Cache-Control": "private, no-cache"}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(
+                self.last_modified.astimezone(UTC), usegmt=True
+            )
+        return headers
+
+    def is_not_modified(
+        self, if_none_match: Optional[str], if_modified_since: Optional[str]
+    ) -> bool:
+        """
+        Проверяет условия запроса; If-None-Match имеет приоритет над If-Modified-Since.
+
+        :param if_none_match: Значение заголовка If-None-Match.
+        :param if_modified_since: Значение заголовка If-Modified-Since.
+        :return: True, если клиенту можно ответить 304 Not Modified.
+        """
+        if if_none_match is not None:
+            tags = {tag.strip() for tag in if_none_match.split(",")}
+            weak = self.etag.removeprefix("W/")
+            return "*" in tags or self.etag in tags or weak in tags
+        if if_modified_since is None or self.last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=UTC)
+        return self.last_modified.replace(microsecond=0) <= since
+
+
 class JWTHandler:
     def __init__(
         self, secret_key: str, algorithm: str = "HS256", expiration_minutes: int = 30
@@ -78,9 +141,11 @@ class JWTHandler:
         :raises jwt.ExpiredSignatureError: Если срок действия токена истек.
         :raises jwt.InvalidTokenError: Если токен недействителен.
         """
-        options = {"verify_signature": False}
         return jwt.decode(
-            token, self.secret_key, algorithms=[self.algorithm], options=options
+            token,
+            self.secret_key,
+            algorithms=[self.algorithm],
+            options={"require": ["exp"]},
         )
 
     def is_token_valid(self, token: str) -> bool:
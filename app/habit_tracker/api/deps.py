@@ -1,28 +1,20 @@
+import uuid
 from typing import Annotated
 
 import fastapi
+import jwt
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from app.core.repositories.sqlalchemy.uow import UnitOfWork
+from app.core.exc import IncorrectTokenFormatException, TokenExpiredException
 from app.core.settings import settings
 from app.core.utils import JWTHandler
+from app.habit_tracker.service.auth import AuthService
 from app.habit_tracker.service.habits import HabitsService
+from app.habit_tracker.service.sync import SyncService
+from app.habit_tracker.service.users import UsersService
 
 
-def get_service(srv_class):
-    """Init service."""
-
-    def dep(request: fastapi.Request):
-        """Init depends."""
-        uow = UnitOfWork(request.app.state.pg_async_session_maker)
-        return srv_class(uow)
-
-    return dep
-
-
-LeadsDEP = Annotated[HabitsService, Depends(get_service(HabitsService))]
-
 http_bearer = HTTPBearer(auto_error=False)
 
 
@@ -39,8 +31,12 @@ def get_token(
             detail="Authorization token is missing",
         )
     jwt_handler = JWTHandler(secret_key=settings.secret_key)
-    payload = jwt_handler.decode_token(credentials.credentials.encode())
-    return payload
+    try:
+        return jwt_handler.decode_token(credentials.credentials)
+    except jwt.ExpiredSignatureError:
+        raise TokenExpiredException()
+    except jwt.InvalidTokenError:
+        raise IncorrectTokenFormatException()
 
 
 def is_valid_token(
@@ -56,4 +52,53 @@ def is_valid_token(
             detail="Authorization token is missing",
         )
     jwt_handler = JWTHandler(secret_key=settings.secret_key)
-    return jwt_handler.is_token_valid(credentials)
+    return jwt_handler.is_token_valid(credentials.credentials)
+
+
+def get_user_id(payload: Annotated[dict, Depends(get_token)]) -> uuid.UUID:
+    """Зависимость для извлечения UUID пользователя из токена."""
+    try:
+        return uuid.UUID(str(payload["uuid"]))
+    except (KeyError, ValueError):
+        raise IncorrectTokenFormatException()
+
+
+UserIdDEP = Annotated[uuid.UUID, Depends(get_user_id)]
+
+
+def get_service(srv_class):
+    """Init service on the shard of the current user."""
+
+    def dep(request: fastapi.Request, user_id: UserIdDEP):
+        """Init depends."""
+        uow = request.app.state.shard_router.uow_for(user_id)
+        return srv_class(uow)
+
+    return dep
+
+
+def get_habits_service(request: fastapi.Request, user_id: UserIdDEP) -> HabitsService:
+    """Init habits service with the shared write buffer."""
+    uow = request.app.state.shard_router.uow_for(user_id)
+    return HabitsService(uow, write_buffer=request.app.state.write_buffer)
+
+
+HabitsDEP = Annotated[HabitsService, Depends(get_habits_service)]
+UsersDEP = Annotated[UsersService, Depends(get_service(UsersService))]
+SyncDEP = Annotated[SyncService, Depends(get_service(SyncService))]
+
+
+def get_auth_service(request: fastapi.Request) -> AuthService:
+    """Init auth service with the shared password hasher."""
+    jwt_handler = JWTHandler(
+        secret_key=settings.secret_key,
+        expiration_minutes=settings.access_token_expire_minutes,
+    )
+    return AuthService(
+        request.app.state.shard_router,
+        password_hasher=request.app.state.password_hasher,
+        jwt_handler=jwt_handler,
+    )
+
+
+AuthDEP = Annotated[AuthService, Depends(get_auth_service)]
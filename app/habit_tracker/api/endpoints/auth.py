@@ -0,0 +1,17 @@
+from fastapi import APIRouter, status
+
+from app.habit_tracker.api import deps
+from app.habit_tracker.entity.auth import Token, UserLogin, UserRegister
+from app.habit_tracker.entity.users import UserRead
+
+router = APIRouter(prefix="/auth", tags=["Auth"])
+
+
+@router.post("/register", status_code=status.HTTP_201_CREATED, response_model=UserRead)
+async def register(service: deps.AuthDEP, data: UserRegister):
+    return await service.register(data=data)
+
+
+@router.post("/login", response_model=Token)
+async def login(service: deps.AuthDEP, data: UserLogin):
+    return await service.login(data=data)
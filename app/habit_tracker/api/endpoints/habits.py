@@ -1,14 +1,157 @@
-from fastapi import APIRouter, Depends, status
+import datetime
+import uuid
+from typing import List
 
+from fastapi import APIRouter, Header, Query, Response, status
+from fastapi.responses import JSONResponse
+
+from app.core.utils import Validators
 from app.habit_tracker.api import deps
-from app.habit_tracker.api.deps import get_token
-from app.habit_tracker.entity.habits import HabitCreate
+from app.habit_tracker.entity.habits import (
+    HabitCreate,
+    HabitLogCreate,
+    HabitLogRead,
+    HabitPeriodStat,
+    HabitRead,
+    HabitsPage,
+    HabitWithLogs,
+    StatsPeriod,
+)
 
 router = APIRouter(prefix="/habits", tags=["Habits"])
 
 
-@router.post("", status_code=status.HTTP_201_CREATED)
+@router.post("", status_code=status.HTTP_201_CREATED, response_model=HabitRead)
 async def create_habit(
-    service: deps.LeadsDEP, data: HabitCreate, payload: dict = Depends(get_token)
+    service: deps.HabitsDEP, data: HabitCreate, user_id: deps.UserIdDEP
+):
+    return await service.create_habit(data=data, user_id=user_id)
+
+
+@router.get("", response_model=HabitsPage)
+async def list_habits(
+    service: deps.HabitsDEP,
+    response: Response,
+    user_id: deps.UserIdDEP,
+    limit: int = Query(20, ge=1, le=100),
+    page: int = Query(1, ge=1),
+    fields: str | None = Query(
+        None, description="Список возвращаемых полей через запятую, например uuid,name"
+    ),
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
+):
+    field_list = [name.strip() for name in (fields or "").split(",") if name.strip()]
+    count, last_modified = await service.get_habits_version(user_id=user_id)
+    validators = Validators.from_version(
+        count, last_modified, limit, page, ",".join(sorted(field_list))
+    )
+    if validators.is_not_modified(if_none_match, if_modified_since):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=validators.headers
+        )
+    if field_list:
+        total, items = await service.list_habits_sparse(
+            user_id=user_id, limit=limit, page=page, fields=field_list
+        )
+        return JSONResponse(
+            content={
+                "total": total,
+                "items": [item.model_dump(mode="json") for item in items],
+            },
+            headers=validators.headers,
+        )
+    response.headers.update(validators.headers)
+    return await service.list_habits(user_id=user_id, limit=limit, page=page)
+
+
+@router.get("/recent-logs", response_model=List[HabitWithLogs])
+async def list_habits_with_recent_logs(
+    service: deps.HabitsDEP,
+    user_id: deps.UserIdDEP,
+    days: int = Query(7, ge=1, le=31),
+):
+    return await service.list_habits_with_recent_logs(user_id=user_id, days=days)
+
+
+@router.get("/{habit_id}", response_model=HabitRead)
+async def get_habit(
+    service: deps.HabitsDEP,
+    habit_id: uuid.UUID,
+    response: Response,
+    user_id: deps.UserIdDEP,
+    if_none_match: str | None = Header(None),
+    if_modified_since: str | None = Header(None),
+):
+    count, last_modified = await service.get_habit_version(
+        habit_id=habit_id, user_id=user_id
+    )
+    validators = Validators.from_version(count, last_modified, habit_id)
+    if validators.is_not_modified(if_none_match, if_modified_since):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=validators.headers
+        )
+    response.headers.update(validators.headers)
+    return await service.get_habit(habit_id=habit_id, user_id=user_id)
+
+
+@router.delete("/{habit_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_habit(
+    service: deps.HabitsDEP, habit_id: uuid.UUID, user_id: deps.UserIdDEP
+):
+    await service.delete_habit(habit_id=habit_id, user_id=user_id)
+
+
+@router.post(
+    "/{habit_id}/logs",
+    status_code=status.HTTP_201_CREATED,
+    response_model=HabitLogRead,
+)
+async def create_habit_log(
+    service: deps.HabitsDEP,
+    habit_id: uuid.UUID,
+    data: HabitLogCreate,
+    user_id: deps.UserIdDEP,
+):
+    return await service.add_log(habit_id=habit_id, data=data, user_id=user_id)
+
+
+@router.get("/{habit_id}/logs", response_model=List[HabitLogRead])
+async def get_habit_logs(
+    service: deps.HabitsDEP,
+    habit_id: uuid.UUID,
+    date_from: datetime.date,
+    date_to: datetime.date,
+    user_id: deps.UserIdDEP,
+):
+    return await service.get_logs(
+        habit_id=habit_id, user_id=user_id, date_from=date_from, date_to=date_to
+    )
+
+
+@router.delete("/{habit_id}/logs/{log_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_habit_log(
+    service: deps.HabitsDEP,
+    habit_id: uuid.UUID,
+    log_id: uuid.UUID,
+    user_id: deps.UserIdDEP,
+):
+    await service.delete_log(habit_id=habit_id, log_id=log_id, user_id=user_id)
+
+
+@router.get("/{habit_id}/stats", response_model=List[HabitPeriodStat])
+async def get_habit_stats(
+    service: deps.HabitsDEP,
+    habit_id: uuid.UUID,
+    date_from: datetime.date,
+    date_to: datetime.date,
+    user_id: deps.UserIdDEP,
+    period: StatsPeriod = "day",
 ):
-    return await service.create_lead(data=data, user_id=payload["uuid"])
+    return await service.get_stats(
+        habit_id=habit_id,
+        user_id=user_id,
+        period=period,
+        date_from=date_from,
+        date_to=date_to,
+    )
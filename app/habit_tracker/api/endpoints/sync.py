@@ -0,0 +1,52 @@
+import datetime
+import uuid
+
+from fastapi import APIRouter, Query
+
+from app.habit_tracker.api import deps
+from app.habit_tracker.entity.sync import (
+    HabitLogsSyncPage,
+    HabitsSyncPage,
+    TombstonesSyncPage,
+)
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+
+@router.get("/habits", response_model=HabitsSyncPage)
+async def sync_habits(
+    service: deps.SyncDEP,
+    user_id: deps.UserIdDEP,
+    updated_after: datetime.datetime | None = None,
+    after_uuid: uuid.UUID | None = None,
+    limit: int = Query(500, ge=1, le=1000),
+):
+    return await service.sync_habits(
+        user_id=user_id, updated_after=updated_after, after_uuid=after_uuid, limit=limit
+    )
+
+
+@router.get("/logs", response_model=HabitLogsSyncPage)
+async def sync_logs(
+    service: deps.SyncDEP,
+    user_id: deps.UserIdDEP,
+    updated_after: datetime.datetime | None = None,
+    after_uuid: uuid.UUID | None = None,
+    limit: int = Query(500, ge=1, le=1000),
+):
+    return await service.sync_logs(
+        user_id=user_id, updated_after=updated_after, after_uuid=after_uuid, limit=limit
+    )
+
+
+@router.get("/tombstones", response_model=TombstonesSyncPage)
+async def sync_tombstones(
+    service: deps.SyncDEP,
+    user_id: deps.UserIdDEP,
+    updated_after: datetime.datetime | None = None,
+    after_uuid: uuid.UUID | None = None,
+    limit: int = Query(500, ge=1, le=1000),
+):
+    return await service.sync_tombstones(
+        user_id=user_id, updated_after=updated_after, after_uuid=after_uuid, limit=limit
+    )
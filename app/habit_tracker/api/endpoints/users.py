@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+
+from app.habit_tracker.api import deps
+from app.habit_tracker.entity.users import UserRead, UserTimezoneUpdate
+
+router = APIRouter(prefix="/users", tags=["Users"])
+
+
+@router.get("/me", response_model=UserRead)
+async def get_me(service: deps.UsersDEP, user_id: deps.UserIdDEP):
+    return await service.get_user(user_id=user_id)
+
+
+@router.patch("/me/timezone", response_model=UserRead)
+async def set_timezone(
+    service: deps.UsersDEP, data: UserTimezoneUpdate, user_id: deps.UserIdDEP
+):
+    return await service.set_timezone(user_id=user_id, data=data)
@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+
+
+class UserRegister(BaseModel):
+    username: str
+    email: str
+    password: str = Field(min_length=8)
+
+
+class UserLogin(BaseModel):
+    email: str
+    password: str
+
+
+class Token(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
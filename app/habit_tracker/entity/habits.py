@@ -1,6 +1,69 @@
+import datetime
+import uuid
+from typing import Literal
+
 from pydantic import BaseModel
 
 
 class HabitCreate(BaseModel):
     name: str
     description: str
+    is_quantifiable: bool = False
+    target_quantity: float | None = None
+    unit: str | None = None
+
+
+class HabitRead(BaseModel):
+    uuid: uuid.UUID
+    user_id: uuid.UUID
+    name: str
+    description: str | None
+    is_quantifiable: bool
+    target_quantity: float | None
+    unit: str | None
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
+
+
+class HabitsPage(BaseModel):
+    total: int
+    items: list[HabitRead]
+
+
+class HabitLogCreate(BaseModel):
+    date: datetime.datetime | None = None
+    is_completed: bool | None = None
+    quantity: float | None = None
+
+
+class HabitLogRead(BaseModel):
+    uuid: uuid.UUID
+    habit_id: uuid.UUID
+    date: datetime.datetime
+    local_day: datetime.date
+    is_completed: bool | None
+    quantity: float | None
+
+
+class HabitWithLogs(HabitRead):
+    logs: list[HabitLogRead] = []
+
+
+class HabitDailyStatRead(BaseModel):
+    habit_id: uuid.UUID
+    day: datetime.date
+    is_completed: bool
+    quantity_sum: float
+    logs_count: int
+    target_hit: bool
+
+
+StatsPeriod = Literal["day", "week"]
+
+
+class HabitPeriodStat(BaseModel):
+    period_start: datetime.date
+    completed_days: int
+    target_hit_days: int
+    quantity_sum: float
+    logs_count: int
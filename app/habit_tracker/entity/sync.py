@@ -0,0 +1,36 @@
+import datetime
+import uuid
+
+from pydantic import BaseModel
+
+from app.habit_tracker.entity.habits import HabitLogRead, HabitRead
+
+
+class SyncCursor(BaseModel):
+    updated_at: datetime.datetime
+    uuid: uuid.UUID
+
+
+class TombstoneRead(BaseModel):
+    uuid: uuid.UUID
+    entity_type: str
+    entity_id: uuid.UUID
+    updated_at: datetime.datetime
+
+
+class HabitsSyncPage(BaseModel):
+    items: list[HabitRead]
+    cursor: SyncCursor | None
+    has_more: bool
+
+
+class HabitLogsSyncPage(BaseModel):
+    items: list[HabitLogRead]
+    cursor: SyncCursor | None
+    has_more: bool
+
+
+class TombstonesSyncPage(BaseModel):
+    items: list[TombstoneRead]
+    cursor: SyncCursor | None
+    has_more: bool
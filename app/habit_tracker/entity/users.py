@@ -0,0 +1,20 @@
+import uuid
+
+from pydantic import BaseModel
+
+
+class UserRead(BaseModel):
+    uuid: uuid.UUID
+    username: str
+    email: str
+    timezone: str
+
+
+class UserTimezoneUpdate(BaseModel):
+    timezone: str
+
+
+class LoginEntryRead(BaseModel):
+    uuid: uuid.UUID
+    email: str
+    username: str
@@ -1,6 +1,18 @@
 import datetime
+import uuid
 
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, String
+from sqlalchemy import (
+    Boolean,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    Uuid,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.repositories.sqlalchemy.base_model import Base, TimestampMixin, UuidMixin
@@ -12,13 +24,21 @@ class User(Base, UuidMixin, TimestampMixin):
     username: Mapped[str] = mapped_column(String, unique=True, nullable=False)
     email: Mapped[str] = mapped_column(String, unique=True, nullable=False)
     hashed_password: Mapped[str] = mapped_column(String, nullable=False)
+    timezone: Mapped[str] = mapped_column(
+        String, default="UTC", server_default="UTC", nullable=False
+    )  # IANA-имя часового пояса (например, "Europe/Moscow")
     habits: Mapped[list["Habit"]] = relationship(back_populates="user")
 
 
 class Habit(Base, UuidMixin, TimestampMixin):
     __tablename__ = "habits"
+    __table_args__ = (
+        Index("ix_habits_user_id_updated_at_uuid", "user_id", "updated_at", "uuid"),
+    )
 
-    user_id: Mapped[str] = mapped_column(ForeignKey("users.id"), nullable=False)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.uuid"), nullable=False
+    )
     name: Mapped[str] = mapped_column(String, nullable=False)
     description: Mapped[str | None] = mapped_column(String, nullable=True)
     is_quantifiable: Mapped[bool] = mapped_column(
@@ -34,13 +54,29 @@ class Habit(Base, UuidMixin, TimestampMixin):
     logs: Mapped[list["HabitLog"]] = relationship(back_populates="habit")
 
 
+def utc_now() -> datetime.datetime:
+    """Текущее время в UTC."""
+    return datetime.datetime.now(datetime.UTC)
+
+
 class HabitLog(Base, UuidMixin, TimestampMixin):
     __tablename__ = "habit_logs"
+    __table_args__ = (
+        Index("ix_habit_logs_habit_id_local_day", "habit_id", "local_day"),
+        Index(
+            "ix_habit_logs_habit_id_updated_at_uuid", "habit_id", "updated_at", "uuid"
+        ),
+    )
 
-    habit_id: Mapped[str] = mapped_column(ForeignKey("habits.id"), nullable=False)
+    habit_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("habits.uuid"), nullable=False
+    )
     date: Mapped[datetime.datetime] = mapped_column(
-        DateTime, default=datetime.datetime.now(datetime.UTC), nullable=False
+        DateTime(timezone=True), default=utc_now, nullable=False
     )
+    local_day: Mapped[datetime.date] = mapped_column(
+        Date, nullable=False
+    )  # День отметки в часовом поясе пользователя на момент записи
     is_completed: Mapped[bool | None] = mapped_column(
         Boolean, nullable=True
     )  # Для привычек "да/нет"
@@ -48,3 +84,54 @@ class HabitLog(Base, UuidMixin, TimestampMixin):
         Float, nullable=True
     )  # Для количественных привычек
     habit: Mapped["Habit"] = relationship(back_populates="logs")
+
+
+class HabitDailyStat(Base, UuidMixin, TimestampMixin):
+    """Дневной агрегат по привычке, поддерживаемый при записи логов."""
+
+    __tablename__ = "habit_daily_stats"
+    __table_args__ = (UniqueConstraint("habit_id", "day"),)
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.uuid", ondelete="CASCADE"), nullable=False, index=True
+    )
+    habit_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("habits.uuid", ondelete="CASCADE"), nullable=False
+    )
+    day: Mapped[datetime.date] = mapped_column(Date, nullable=False)
+    is_completed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    quantity_sum: Mapped[float] = mapped_column(Float, default=0, nullable=False)
+    logs_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    target_hit: Mapped[bool] = mapped_column(
+        Boolean, default=False, nullable=False
+    )  # Выполнена ли дневная цель
+
+
+class Tombstone(Base, UuidMixin, TimestampMixin):
+    """Запись об удалённой сущности для дельта-синхронизации клиентов."""
+
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_user_id_updated_at_uuid", "user_id", "updated_at", "uuid"),
+    )
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.uuid", ondelete="CASCADE"), nullable=False
+    )
+    entity_type: Mapped[str] = mapped_column(
+        String, nullable=False
+    )  # Имя таблицы удалённой сущности
+    entity_id: Mapped[uuid.UUID] = mapped_column(Uuid, nullable=False)
+
+
+class LoginEntry(Base, UuidMixin, TimestampMixin):
+    """Глобальный справочник логинов: email и username -> UUID пользователя.
+
+    Хранится на фиксированном шарде справочника и обеспечивает уникальность
+    логинов между шардами.
+    """
+
+    __tablename__ = "login_directory"
+
+    email: Mapped[str] = mapped_column(String, unique=True, nullable=False)
+    username: Mapped[str] = mapped_column(String, unique=True, nullable=False)
@@ -0,0 +1,700 @@
+import datetime
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    Date,
+    and_,
+    bindparam,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import exc
+from app.core.repositories.abc_repository import Entity, VersionResult
+from app.core.repositories.sqlalchemy.repository import SQLAlchemyRepository
+from app.core.settings import settings
+from app.habit_tracker.entity.habits import (
+    HabitDailyStatRead,
+    HabitLogRead,
+    HabitPeriodStat,
+    HabitRead,
+    HabitWithLogs,
+    StatsPeriod,
+)
+from app.habit_tracker.entity.sync import SyncCursor, TombstoneRead
+from app.habit_tracker.entity.users import LoginEntryRead, UserRead
+from app.habit_tracker.repositories.sqlalchemy.models import (
+    Habit,
+    HabitDailyStat,
+    HabitLog,
+    LoginEntry,
+    Tombstone,
+    User,
+)
+
+SyncResult = Tuple[List[Entity], Optional[SyncCursor], bool]
+UserRows = Dict[str, List[Dict[str, Any]]]
+
+# Модели с данными пользователя в порядке вставки (с учётом внешних ключей)
+USER_OWNED_MODELS = (User, Habit, HabitLog, HabitDailyStat, Tombstone)
+IMPORT_CHUNK_SIZE = 1000
+
+# `updated_at` заполняется временем начала транзакции, поэтому запись
+# может стать видимой позже записей с большим `updated_at`
+SYNC_SAFETY_LAG = datetime.timedelta(seconds=settings.sync_safety_lag_seconds)
+
+
+@dataclass
+class StatIncrement:
+    """Приращение дневного агрегата привычки."""
+
+    habit: HabitRead
+    day: datetime.date
+    is_completed: bool
+    quantity: float
+    logs_count: int = 1
+
+
+class SyncMixin:
+    """Постраничная выборка изменённых записей по курсору `(updated_at, uuid)`."""
+
+    async def find_changed_page(
+        self, stmt, cursor: Optional[SyncCursor], limit: int
+    ) -> SyncResult:
+        """
+        Выбирает записи, изменённые после курсора, в порядке `(updated_at, uuid)`.
+
+        Записи моложе `SYNC_SAFETY_LAG` не отдаются: транзакция, начатая раньше,
+        но зафиксированная позже, не должна оказаться позади выданного курсора.
+
+        :param stmt: Базовый select модели, ограниченный записями пользователя.
+        :param cursor: Позиция последней полученной клиентом записи.
+        :param limit: Максимальное количество записей.
+        :return: Записи, курсор последней записи и признак наличия следующих.
+        """
+        model = self.model
+        stmt = stmt.where(model.updated_at < func.now() - literal(SYNC_SAFETY_LAG))
+        if cursor is not None:
+            stmt = stmt.where(
+                tuple_(model.updated_at, model.uuid)
+                > tuple_(literal(cursor.updated_at), literal(cursor.uuid))
+            )
+        stmt = stmt.order_by(model.updated_at, model.uuid).limit(limit + 1)
+        instances = (await self.session.execute(stmt)).scalars().all()
+        has_more = len(instances) > limit
+        instances = instances[:limit]
+        if instances:
+            cursor = SyncCursor(
+                updated_at=instances[-1].updated_at, uuid=instances[-1].uuid
+            )
+        items = [self.to_read_model(instance) for instance in instances]
+        return items, cursor, has_more
+
+
+def tombstone_values(user_id, entity_type: str, entity_id) -> dict:
+    """Значения tombstone-записи об удалённой сущности."""
+    return {"user_id": user_id, "entity_type": entity_type, "entity_id": entity_id}
+
+
+class UsersRepository(SQLAlchemyRepository):
+    """Репозиторий пользователей."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session=session, model=User, schema=UserRead)
+
+    async def get_timezone(self, user_id: uuid.UUID) -> str:
+        """
+        Возвращает часовой пояс пользователя, не загружая остальные колонки.
+
+        :param user_id: UUID пользователя.
+        :return: IANA-имя часового пояса.
+        """
+        stmt = select(User.timezone).where(User.uuid == user_id)
+        timezone = (await self.session.execute(stmt)).scalar_one_or_none()
+        if timezone is None:
+            raise exc.NotFoundError(f"{self.name} не найден")
+        return timezone
+
+    async def export_user_rows(self, user_id: uuid.UUID) -> UserRows:
+        """
+        Выгружает все строки пользователя из таблиц с его данными.
+
+        :param user_id: UUID пользователя.
+        :return: Строки по именам таблиц.
+        """
+        rows: UserRows = {}
+        for model in USER_OWNED_MODELS:
+            stmt = select(model.__table__).where(self._owned_by(model, user_id))
+            result = await self.session.execute(stmt)
+            rows[model.__tablename__] = [dict(row) for row in result.mappings()]
+        return rows
+
+    async def import_user_rows(self, rows: UserRows) -> bool:
+        """
+        Загружает строки пользователя, пропуская уже существующие
+        (повторный перенос безопасен).
+
+        :param rows: Строки по именам таблиц.
+        :return: True при успешной загрузке.
+        """
+        for model in USER_OWNED_MODELS:
+            table_rows = rows.get(model.__tablename__, [])
+            for start in range(0, len(table_rows), IMPORT_CHUNK_SIZE):
+                chunk = table_rows[start : start + IMPORT_CHUNK_SIZE]
+                stmt = pg_insert(model.__table__).values(chunk).on_conflict_do_nothing()
+                await self.session.execute(stmt)
+        return True
+
+    async def delete_user_rows(self, user_id: uuid.UUID) -> bool:
+        """
+        Удаляет все строки пользователя (без записи tombstone).
+
+        :param user_id: UUID пользователя.
+        :return: True при успешном удалении.
+        """
+        for model in reversed(USER_OWNED_MODELS):
+            await self.session.execute(
+                delete(model).where(self._owned_by(model, user_id))
+            )
+        return True
+
+    @staticmethod
+    def _owned_by(model: Any, user_id: uuid.UUID) -> Any:
+        """Условие принадлежности строк модели пользователю."""
+        if model is User:
+            return User.uuid == user_id
+        if model is HabitLog:
+            return HabitLog.habit_id.in_(
+                select(Habit.uuid).where(Habit.user_id == user_id)
+            )
+        return model.user_id == user_id
+
+    async def get_credentials(self, email: str) -> Optional[Tuple[uuid.UUID, str]]:
+        """
+        Возвращает UUID и хеш пароля пользователя по email.
+
+        :param email: Email пользователя.
+        :return: Пара (UUID, хеш пароля) или None, если пользователь не найден.
+        """
+        stmt = select(User.uuid, User.hashed_password).where(User.email == email)
+        row = (await self.session.execute(stmt)).one_or_none()
+        return tuple(row) if row else None
+
+    async def get_login_chunk(
+        self, after: Optional[uuid.UUID], limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Возвращает очередную порцию логинов пользователей (keyset-пагинация).
+
+        :param after: UUID последнего пользователя предыдущей порции.
+        :param limit: Размер порции.
+        :return: Строки `uuid`, `email`, `username`, отсортированные по UUID.
+        """
+        stmt = (
+            select(User.uuid, User.email, User.username)
+            .order_by(User.uuid)
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(User.uuid > after)
+        result = await self.session.execute(stmt)
+        return [dict(row) for row in result.mappings()]
+
+    async def get_uuid_chunk(
+        self, after: Optional[uuid.UUID], limit: int
+    ) -> List[uuid.UUID]:
+        """
+        Возвращает очередную порцию UUID пользователей (keyset-пагинация).
+
+        :param after: UUID последнего пользователя предыдущей порции.
+        :param limit: Размер порции.
+        :return: Список UUID пользователей, отсортированных по возрастанию.
+        """
+        stmt = select(User.uuid).order_by(User.uuid).limit(limit)
+        if after is not None:
+            stmt = stmt.where(User.uuid > after)
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+
+class LoginDirectoryRepository(SQLAlchemyRepository):
+    """Репозиторий глобального справочника логинов."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session=session, model=LoginEntry, schema=LoginEntryRead)
+
+    async def find_user_id(self, email: str) -> Optional[uuid.UUID]:
+        """
+        Возвращает UUID пользователя по email.
+
+        :param email: Email пользователя.
+        :return: UUID пользователя или None, если логин не зарегистрирован.
+        """
+        stmt = select(LoginEntry.uuid).where(LoginEntry.email == email)
+        return (await self.session.execute(stmt)).scalar_one_or_none()
+
+    async def add_missing(self, rows: Sequence[Dict[str, Any]]) -> bool:
+        """
+        Добавляет логины, пропуская уже зарегистрированные.
+
+        :param rows: Строки `uuid`, `email`, `username`.
+        :return: True при успешной загрузке.
+        """
+        if rows:
+            stmt = pg_insert(LoginEntry).values(list(rows)).on_conflict_do_nothing()
+            await self.session.execute(stmt)
+        return True
+
+
+class HabitsRepository(SyncMixin, SQLAlchemyRepository):
+    """Репозиторий привычек."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session=session, model=Habit, schema=HabitRead)
+
+    async def get_list_version(self, user_id: uuid.UUID) -> VersionResult:
+        """
+        Возвращает версию списка привычек пользователя.
+
+        Время изменения учитывает и удаления (tombstone-записи привычек),
+        иначе удаление не самой свежей привычки не меняло бы Last-Modified.
+
+        :param user_id: UUID владельца привычек.
+        :return: Количество привычек и время последнего изменения списка.
+        """
+        deleted_at = (
+            select(func.max(Tombstone.updated_at))
+            .where(
+                Tombstone.user_id == user_id,
+                Tombstone.entity_type == Habit.__tablename__,
+            )
+            .scalar_subquery()
+        )
+        last_modified = func.greatest(func.max(Habit.updated_at), deleted_at)
+        stmt = select(func.count(Habit.uuid), last_modified).where(
+            Habit.user_id == user_id
+        )
+        count, last_modified = (await self.session.execute(stmt)).one()
+        return count, last_modified
+
+    async def find_changed(
+        self, user_id: uuid.UUID, cursor: Optional[SyncCursor], limit: int
+    ) -> SyncResult:
+        """
+        Возвращает привычки пользователя, изменённые после курсора.
+
+        :param user_id: UUID владельца привычек.
+        :param cursor: Позиция последней полученной клиентом записи.
+        :param limit: Максимальное количество записей.
+        :return: Привычки, новый курсор и признак наличия следующих.
+        """
+        stmt = select(Habit).where(Habit.user_id == user_id)
+        return await self.find_changed_page(stmt, cursor, limit)
+
+    async def delete_with_id(self, uuid: uuid.UUID) -> bool:
+        """
+        Удаляет привычку вместе с её отметками и записывает tombstone
+        для привычки и каждой отметки.
+
+        :param uuid: UUID привычки.
+        :return: True при успешном удалении, иначе ошибка.
+        """
+        user_id = (
+            await self.session.execute(select(Habit.user_id).where(Habit.uuid == uuid))
+        ).scalar_one_or_none()
+        if user_id is None:
+            raise exc.NotFoundError(f"{self.name} не найден")
+
+        await self.session.execute(
+            insert(Tombstone).from_select(
+                ["uuid", "user_id", "entity_type", "entity_id"],
+                select(
+                    func.gen_random_uuid(),
+                    literal(user_id),
+                    literal(HabitLog.__tablename__),
+                    HabitLog.uuid,
+                ).where(HabitLog.habit_id == uuid),
+            )
+        )
+        await self.session.execute(delete(HabitLog).where(HabitLog.habit_id == uuid))
+        await self.session.execute(
+            delete(HabitDailyStat).where(HabitDailyStat.habit_id == uuid)
+        )
+        await super().delete_with_id(uuid)
+        await self.session.execute(
+            insert(Tombstone).values(
+                **tombstone_values(user_id, Habit.__tablename__, uuid)
+            )
+        )
+        return True
+
+    async def find_with_recent_logs(
+        self, user_id: uuid.UUID, days: int
+    ) -> Tuple[Optional[datetime.date], List[HabitWithLogs]]:
+        """
+        Загружает привычки пользователя вместе с отметками за последние `days` дней.
+
+        Выполняет ровно два запроса: привычки вместе с первым днём окна, который
+        считается в часовом поясе пользователя, и отметки по индексу
+        `(habit_id, local_day)`. Вложенные сущности собираются из строк без
+        создания ORM-объектов.
+
+        :param user_id: UUID владельца привычек.
+        :param days: Количество последних дней, включая сегодняшний.
+        :return: Первый локальный день окна (None, если привычек нет) и привычки
+            с отметками, отсортированными по времени.
+        """
+        today = cast(func.timezone(User.timezone, func.now()), Date)
+        habits_stmt = (
+            select(*Habit.__table__.columns, (today - (days - 1)).label("since"))
+            .join(User, User.uuid == Habit.user_id)
+            .where(Habit.user_id == user_id)
+            .order_by(Habit.created_at)
+        )
+        since = None
+        habits = []
+        for row in (await self.session.execute(habits_stmt)).mappings():
+            values = dict(row)
+            since = values.pop("since")
+            habits.append(HabitWithLogs.model_validate(values))
+        if not habits:
+            return since, habits
+
+        by_uuid = {habit.uuid: habit for habit in habits}
+        log_columns = [getattr(HabitLog, name) for name in HabitLogRead.model_fields]
+        logs_stmt = (
+            select(*log_columns)
+            .where(HabitLog.habit_id.in_(by_uuid), HabitLog.local_day >= since)
+            .order_by(HabitLog.habit_id, HabitLog.date)
+        )
+        for row in (await self.session.execute(logs_stmt)).mappings():
+            log = HabitLogRead.model_validate(dict(row))
+            by_uuid[log.habit_id].logs.append(log)
+        return since, habits
+
+
+class HabitLogsRepository(SyncMixin, SQLAlchemyRepository):
+    """Репозиторий отметок выполнения привычек."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session=session, model=HabitLog, schema=HabitLogRead)
+
+    async def find_changed(
+        self, user_id: uuid.UUID, cursor: Optional[SyncCursor], limit: int
+    ) -> SyncResult:
+        """
+        Возвращает отметки привычек пользователя, изменённые после курсора.
+
+        :param user_id: UUID владельца привычек.
+        :param cursor: Позиция последней полученной клиентом записи.
+        :param limit: Максимальное количество записей.
+        :return: Отметки, новый курсор и признак наличия следующих.
+        """
+        stmt = select(HabitLog).where(
+            HabitLog.habit_id.in_(select(Habit.uuid).where(Habit.user_id == user_id))
+        )
+        return await self.find_changed_page(stmt, cursor, limit)
+
+    async def delete_with_id(self, uuid: uuid.UUID) -> bool:
+        """
+        Удаляет отметку и записывает tombstone для синхронизации клиентов.
+
+        :param uuid: UUID отметки.
+        :return: True при успешном удалении, иначе ошибка.
+        """
+        stmt = (
+            delete(HabitLog).where(HabitLog.uuid == uuid).returning(HabitLog.habit_id)
+        )
+        habit_id = (await self.session.execute(stmt)).scalar_one_or_none()
+        if habit_id is None:
+            raise exc.NotFoundError(f"{self.name} не найден")
+        user_id = select(Habit.user_id).where(Habit.uuid == habit_id).scalar_subquery()
+        await self.session.execute(
+            insert(Tombstone).values(
+                **tombstone_values(user_id, HabitLog.__tablename__, uuid)
+            )
+        )
+        return True
+
+    async def find_for_days(
+        self, habit_id: uuid.UUID, date_from: datetime.date, date_to: datetime.date
+    ) -> List[HabitLogRead]:
+        """
+        Ищет отметки привычки за диапазон локальных дней пользователя.
+
+        Использует индекс `(habit_id, local_day)`.
+
+        :param habit_id: UUID привычки.
+        :param date_from: Первый локальный день (включительно).
+        :param date_to: Последний локальный день (включительно).
+        :return: Список отметок, отсортированный по времени.
+        """
+        stmt = (
+            select(HabitLog)
+            .where(
+                HabitLog.habit_id == habit_id,
+                HabitLog.local_day >= date_from,
+                HabitLog.local_day <= date_to,
+            )
+            .order_by(HabitLog.date)
+        )
+        result = await self.session.execute(stmt)
+        return [self.to_read_model(instance) for instance in result.scalars().all()]
+
+
+class TombstonesRepository(SyncMixin, SQLAlchemyRepository):
+    """Репозиторий записей об удалённых сущностях."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session=session, model=Tombstone, schema=TombstoneRead)
+
+    async def find_changed(
+        self, user_id: uuid.UUID, cursor: Optional[SyncCursor], limit: int
+    ) -> SyncResult:
+        """
+        Возвращает удаления сущностей пользователя после курсора.
+
+        :param user_id: UUID пользователя.
+        :param cursor: Позиция последней полученной клиентом записи.
+        :param limit: Максимальное количество записей.
+        :return: Tombstone-записи, новый курсор и признак наличия следующих.
+        """
+        stmt = select(Tombstone).where(Tombstone.user_id == user_id)
+        return await self.find_changed_page(stmt, cursor, limit)
+
+
+class HabitDailyStatsRepository(SQLAlchemyRepository):
+    """Репозиторий дневных агрегатов по привычкам (таблица `habit_daily_stats`)."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(
+            session=session, model=HabitDailyStat, schema=HabitDailyStatRead
+        )
+
+    async def increment(
+        self,
+        habit: HabitRead,
+        day: datetime.date,
+        is_completed: Optional[bool],
+        quantity: Optional[float],
+        logs_count: int = 1,
+    ) -> bool:
+        """
+        Инкрементально применяет новые отметки к дневному агрегату привычки.
+
+        :param habit: Привычка, к которой относятся отметки.
+        :param day: День, за который учитываются отметки.
+        :param is_completed: Признак выполнения из отметки.
+        :param quantity: Количество из отметки.
+        :param logs_count: Количество учитываемых отметок.
+        :return: True при успешном обновлении.
+        """
+        return await self.increment_many(
+            [
+                StatIncrement(
+                    habit=habit,
+                    day=day,
+                    is_completed=bool(is_completed),
+                    quantity=quantity or 0,
+                    logs_count=logs_count,
+                )
+            ]
+        )
+
+    async def increment_many(self, increments: Sequence[StatIncrement]) -> bool:
+        """
+        Применяет пачку приращений к дневным агрегатам одним upsert-запросом.
+
+        Пары `(habit_id, day)` в пачке должны быть уникальны.
+
+        :param increments: Приращения дневных агрегатов.
+        :return: True при успешном обновлении.
+        """
+        if not increments:
+            return True
+        stat = HabitDailyStat
+        stmt = pg_insert(stat).values(
+            [
+                {
+                    "user_id": item.habit.user_id,
+                    "habit_id": item.habit.uuid,
+                    "day": item.day,
+                    "is_completed": item.is_completed,
+                    "quantity_sum": item.quantity,
+                    "logs_count": item.logs_count,
+                    "target_hit": item.is_completed
+                    or (
+                        item.habit.target_quantity is not None
+                        and item.quantity >= item.habit.target_quantity
+                    ),
+                }
+                for item in increments
+            ]
+        )
+        completed_expr = or_(stat.is_completed, stmt.excluded.is_completed)
+        quantity_expr = stat.quantity_sum + stmt.excluded.quantity_sum
+        # `stmt.excluded` в подзапросе превратился бы в отдельный FROM-алиас
+        # таблицы агрегатов, поэтому EXCLUDED указывается напрямую.
+        target = (
+            select(Habit.target_quantity)
+            .where(Habit.uuid == literal_column("excluded.habit_id"))
+            .scalar_subquery()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[stat.habit_id, stat.day],
+            set_={
+                "is_completed": completed_expr,
+                "quantity_sum": quantity_expr,
+                "logs_count": stat.logs_count + stmt.excluded.logs_count,
+                "target_hit": or_(
+                    completed_expr,
+                    func.coalesce(quantity_expr >= target, False),
+                ),
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
+        return True
+
+    async def find_days(
+        self, habit_id: uuid.UUID, days: Sequence[datetime.date]
+    ) -> List[HabitDailyStatRead]:
+        """
+        Возвращает дневные агрегаты привычки за указанные дни.
+
+        :param habit_id: UUID привычки.
+        :param days: Дни.
+        :return: Список найденных агрегатов.
+        """
+        stmt = select(HabitDailyStat).where(
+            HabitDailyStat.habit_id == habit_id, HabitDailyStat.day.in_(days)
+        )
+        result = await self.session.execute(stmt)
+        return [self.to_read_model(instance) for instance in result.scalars().all()]
+
+    async def rebuild_for_users(self, user_ids: Sequence[uuid.UUID]) -> bool:
+        """
+        Полностью пересчитывает агрегаты пользователей по сырым отметкам.
+
+        :param user_ids: UUID пользователей, агрегаты которых пересчитываются.
+        :return: True при успешном пересчёте.
+        """
+        return await self._rebuild(
+            logs_filter=Habit.user_id.in_(user_ids),
+            stats_filter=HabitDailyStat.user_id.in_(user_ids),
+        )
+
+    async def rebuild_days(
+        self, habit_id: uuid.UUID, days: Sequence[datetime.date]
+    ) -> bool:
+        """
+        Пересчитывает агрегаты привычки за указанные дни (например, после
+        удаления отметки).
+
+        :param habit_id: UUID привычки.
+        :param days: Пересчитываемые дни.
+        :return: True при успешном пересчёте.
+        """
+        return await self._rebuild(
+            logs_filter=and_(
+                HabitLog.habit_id == habit_id, HabitLog.local_day.in_(days)
+            ),
+            stats_filter=and_(
+                HabitDailyStat.habit_id == habit_id, HabitDailyStat.day.in_(days)
+            ),
+        )
+
+    async def _rebuild(self, logs_filter, stats_filter) -> bool:
+        """Удаляет агрегаты по `stats_filter` и заново строит их по отметкам."""
+        day = HabitLog.local_day
+        completed = func.coalesce(func.bool_or(HabitLog.is_completed), False)
+        quantity_sum = func.coalesce(func.sum(HabitLog.quantity), 0)
+        source = (
+            select(
+                func.gen_random_uuid(),
+                Habit.user_id,
+                HabitLog.habit_id,
+                day,
+                completed,
+                quantity_sum,
+                func.count(HabitLog.uuid),
+                or_(
+                    completed,
+                    and_(
+                        Habit.target_quantity.is_not(None),
+                        quantity_sum >= Habit.target_quantity,
+                    ),
+                ),
+            )
+            .join(Habit, Habit.uuid == HabitLog.habit_id)
+            .where(logs_filter)
+            .group_by(Habit.user_id, HabitLog.habit_id, day, Habit.target_quantity)
+        )
+        await self.session.execute(delete(HabitDailyStat).where(stats_filter))
+        await self.session.execute(
+            insert(HabitDailyStat).from_select(
+                [
+                    "uuid",
+                    "user_id",
+                    "habit_id",
+                    "day",
+                    "is_completed",
+                    "quantity_sum",
+                    "logs_count",
+                    "target_hit",
+                ],
+                source,
+            )
+        )
+        return True
+
+    async def aggregate(
+        self,
+        habit_id: uuid.UUID,
+        period: StatsPeriod,
+        date_from: datetime.date,
+        date_to: datetime.date,
+    ) -> List[HabitPeriodStat]:
+        """
+        Агрегирует дневные показатели привычки по дням или неделям.
+
+        :param habit_id: UUID привычки.
+        :param period: Период группировки ("day" или "week").
+        :param date_from: Начало диапазона (включительно).
+        :param date_to: Конец диапазона (включительно).
+        :return: Список агрегатов, отсортированный по началу периода.
+        """
+        stat = HabitDailyStat
+        # Единица усечения подставляется литералом, чтобы выражение в SELECT
+        # и GROUP BY совпадало.
+        unit = bindparam("period", period, literal_execute=True)
+        period_start = cast(func.date_trunc(unit, stat.day), Date)
+        stmt = (
+            select(
+                period_start.label("period_start"),
+                func.count().filter(stat.is_completed).label("completed_days"),
+                func.count().filter(stat.target_hit).label("target_hit_days"),
+                func.sum(stat.quantity_sum).label("quantity_sum"),
+                func.sum(stat.logs_count).label("logs_count"),
+            )
+            .where(
+                stat.habit_id == habit_id,
+                stat.day >= date_from,
+                stat.day <= date_to,
+            )
+            .group_by(period_start)
+            .order_by(period_start)
+        )
+        result = await self.session.execute(stmt)
+        return [HabitPeriodStat.model_validate(row._mapping) for row in result]
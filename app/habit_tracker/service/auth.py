@@ -0,0 +1,118 @@
+import uuid
+
+from app.core.exc import AlreadyExists, IncorrectEmailOrPasswordException
+from app.core.repositories.sqlalchemy.shards import ShardRouter
+from app.core.security import PasswordHasher
+from app.core.utils import JWTHandler
+from app.habit_tracker.entity.auth import Token, UserLogin, UserRegister
+from app.habit_tracker.entity.users import UserRead
+
+
+class AuthService:
+    def __init__(
+        self,
+        shard_router: ShardRouter,
+        password_hasher: PasswordHasher,
+        jwt_handler: JWTHandler,
+    ):
+        """
+        Инициализация сервиса.
+
+        Пользователь до входа неизвестен, поэтому сервис получает маршрутизатор
+        шардов, а не Unit of Work конкретного шарда.
+
+        :param shard_router: Маршрутизатор шардов.
+        :param password_hasher: Хешер паролей, работающий в пуле потоков.
+        :param jwt_handler: Обработчик JWT токенов.
+        """
+        self.shard_router = shard_router
+        self.password_hasher = password_hasher
+        self.jwt_handler = jwt_handler
+
+    async def register(self, data: UserRegister) -> UserRead:
+        """
+        Регистрирует пользователя.
+
+        UUID генерируется заранее и определяет шард пользователя. Сначала
+        email и username резервируются в справочнике логинов, уникальные
+        ограничения которого исключают гонку параллельных регистраций на
+        разных шардах. Пароль хешируется вне транзакций, чтобы не держать
+        соединение с БД во время вычисления хеша. Если создать пользователя
+        не удалось, резерв снимается.
+
+        :param data: Данные регистрации.
+        :return: Созданный пользователь.
+        :raises AlreadyExists: Если email или имя пользователя заняты.
+        """
+        user_id = uuid.uuid4()
+        directory_uow = self.shard_router.directory_uow()
+        async with directory_uow:
+            try:
+                await directory_uow.login_directory.add_one_nr(
+                    {"uuid": user_id, "email": data.email, "username": data.username}
+                )
+            except AlreadyExists:
+                raise AlreadyExists(
+                    "Пользователь с таким email или именем уже существует."
+                )
+            await directory_uow.commit()
+
+        try:
+            hashed_password = await self.password_hasher.hash(data.password)
+            uow = self.shard_router.uow_for(user_id)
+            async with uow:
+                user = await uow.users.add_one(
+                    {
+                        "uuid": user_id,
+                        "username": data.username,
+                        "email": data.email,
+                        "hashed_password": hashed_password,
+                    }
+                )
+                await uow.commit()
+                return user
+        except BaseException:
+            directory_uow = self.shard_router.directory_uow()
+            async with directory_uow:
+                await directory_uow.login_directory.delete_with_id(user_id)
+                await directory_uow.commit()
+            raise
+
+    async def login(self, data: UserLogin) -> Token:
+        """
+        Проверяет email и пароль и выдаёт токен доступа.
+
+        Шард пользователя определяется по справочнику логинов, поэтому
+        вход затрагивает два шарда, а не все.
+        Если параметры стоимости хеша изменились, пароль прозрачно
+        перехешируется.
+
+        :param data: Данные входа.
+        :return: Токен доступа.
+        :raises IncorrectEmailOrPasswordException: Если email или пароль неверны.
+        """
+        directory_uow = self.shard_router.directory_uow()
+        async with directory_uow:
+            user_id = await directory_uow.login_directory.find_user_id(data.email)
+        credentials = None
+        if user_id is not None:
+            uow = self.shard_router.uow_for(user_id)
+            async with uow:
+                credentials = await uow.users.get_credentials(data.email)
+        if credentials is None:
+            # Выравниваем время ответа с веткой существующего пользователя.
+            await self.password_hasher.hash(data.password)
+            raise IncorrectEmailOrPasswordException()
+
+        user_id, hashed_password = credentials
+        if not await self.password_hasher.verify(data.password, hashed_password):
+            raise IncorrectEmailOrPasswordException()
+
+        if self.password_hasher.needs_rehash(hashed_password):
+            new_hash = await self.password_hasher.hash(data.password)
+            uow = self.shard_router.uow_for(user_id)
+            async with uow:
+                await uow.users.edit_one(user_id, {"hashed_password": new_hash})
+                await uow.commit()
+
+        return Token(access_token=self.jwt_handler.create_token({"uuid": str(user_id)}))
@@ -1,11 +1,388 @@
+import datetime
+import uuid
+from typing import Dict, List, Optional
+
+from app.core.exc import BadRequestException, NotFoundError
+from app.core.repositories.abc_repository import FindAllResult, VersionResult
 from app.core.repositories.abc_uow import AbstractUnitOfWork
+from app.habit_tracker.entity.habits import (
+    HabitCreate,
+    HabitDailyStatRead,
+    HabitLogCreate,
+    HabitLogRead,
+    HabitPeriodStat,
+    HabitRead,
+    HabitsPage,
+    HabitWithLogs,
+    StatsPeriod,
+)
+from app.habit_tracker.repositories.sqlalchemy.models import utc_now
+from app.habit_tracker.service.utils import as_utc, to_local_day
+from app.habit_tracker.service.write_buffer import PendingIncrement, QuantityWriteBuffer
 
 
 class HabitsService:
-    def __init__(self, uow: AbstractUnitOfWork):
+    def __init__(
+        self,
+        uow: AbstractUnitOfWork,
+        write_buffer: Optional[QuantityWriteBuffer] = None,
+    ):
         """
         Инициализация сервиса с использованием Unit of Work.
 
         :param uow: Абстрактный класс для работы с репозиторием и транзакциями.
+        :param write_buffer: Буфер отложенной записи количественных отметок.
         """
         self.uow = uow
+        self.write_buffer = write_buffer
+
+    async def create_habit(self, data: HabitCreate, user_id: uuid.UUID) -> HabitRead:
+        """
+        Создаёт привычку пользователя.
+
+        :param data: Данные привычки.
+        :param user_id: UUID владельца привычки.
+        :return: Созданная привычка.
+        """
+        async with self.uow:
+            habit = await self.uow.habits.add_one(
+                {**data.model_dump(), "user_id": user_id}
+            )
+            await self.uow.commit()
+            return habit
+
+    async def get_habits_version(self, user_id: uuid.UUID) -> VersionResult:
+        """
+        Возвращает версию списка привычек пользователя без загрузки привычек.
+
+        :param user_id: UUID владельца привычек.
+        :return: Количество привычек и время последнего изменения (включая удаления).
+        """
+        async with self.uow:
+            return await self.uow.habits.get_list_version(user_id)
+
+    async def list_habits(
+        self, user_id: uuid.UUID, limit: int, page: int
+    ) -> HabitsPage:
+        """
+        Возвращает страницу привычек пользователя.
+
+        :param user_id: UUID владельца привычек.
+        :param limit: Количество привычек на странице.
+        :param page: Номер страницы.
+        :return: Страница привычек.
+        """
+        async with self.uow:
+            total, items = await self.uow.habits.find_all_pg(
+                {"user_id": user_id}, limit=limit, page=page
+            )
+            return HabitsPage(total=total, items=items)
+
+    async def list_habits_sparse(
+        self, user_id: uuid.UUID, limit: int, page: int, fields: List[str]
+    ) -> FindAllResult:
+        """
+        Возвращает страницу привычек, загружая из БД только указанные поля.
+
+        :param user_id: UUID владельца привычек.
+        :param limit: Количество привычек на странице.
+        :param page: Номер страницы.
+        :param fields: Возвращаемые поля привычки.
+        :return: Общее количество привычек и урезанные сущности.
+        """
+        async with self.uow:
+            return await self.uow.habits.find_all_pg(
+                {"user_id": user_id}, limit=limit, page=page, fields=fields
+            )
+
+    async def list_habits_with_recent_logs(
+        self, user_id: uuid.UUID, days: int
+    ) -> List[HabitWithLogs]:
+        """
+        Возвращает привычки пользователя с отметками за последние `days` дней.
+
+        Дни считаются в часовом поясе пользователя, включая сегодняшний.
+
+        :param user_id: UUID владельца привычек.
+        :param days: Количество последних дней.
+        :return: Привычки с отметками.
+        """
+        async with self.uow:
+            since, habits = await self.uow.habits.find_with_recent_logs(
+                user_id=user_id, days=days
+            )
+        for habit in habits:
+            pending = [
+                item.to_read_model()
+                for item in self._pending_for(habit.uuid)
+                if item.local_day >= since
+            ]
+            if pending:
+                habit.logs = sorted(
+                    habit.logs + pending, key=lambda log: as_utc(log.date)
+                )
+        return habits
+
+    async def get_habit_version(
+        self, habit_id: uuid.UUID, user_id: uuid.UUID
+    ) -> VersionResult:
+        """
+        Возвращает версию привычки без её загрузки.
+
+        :param habit_id: UUID привычки.
+        :param user_id: UUID владельца привычки.
+        :return: Количество (0 или 1) и время последнего изменения.
+        :raises NotFoundError: Если привычка не найдена.
+        """
+        async with self.uow:
+            count, last_modified = await self.uow.habits.get_version(
+                {"uuid": habit_id, "user_id": user_id}
+            )
+        if count == 0:
+            raise NotFoundError()
+        return count, last_modified
+
+    async def get_habit(self, habit_id: uuid.UUID, user_id: uuid.UUID) -> HabitRead:
+        """
+        Возвращает привычку пользователя.
+
+        :param habit_id: UUID привычки.
+        :param user_id: UUID владельца привычки.
+        :return: Привычка.
+        """
+        async with self.uow:
+            return await self.uow.habits.find_one(
+                {"uuid": habit_id, "user_id": user_id}
+            )
+
+    async def add_log(
+        self, habit_id: uuid.UUID, data: HabitLogCreate, user_id: uuid.UUID
+    ) -> HabitLogRead:
+        """
+        Добавляет отметку выполнения привычки и обновляет дневной агрегат
+        в той же транзакции. Локальный день отметки вычисляется по часовому
+        поясу пользователя на момент записи.
+
+        Чисто количественные отметки количественных привычек при наличии
+        буфера не пишутся сразу, а сливаются в нём по `(habit_id, day)`;
+        ответ в обоих случаях — отметка с присланным количеством.
+
+        :param habit_id: UUID привычки.
+        :param data: Данные отметки.
+        :param user_id: UUID владельца привычки.
+        :return: Созданная отметка.
+        """
+        async with self.uow:
+            habit = await self.uow.habits.find_one(
+                {"uuid": habit_id, "user_id": user_id}
+            )
+            timezone = await self.uow.users.get_timezone(user_id)
+            moment = as_utc(data.date or utc_now())
+            local_day = to_local_day(moment, timezone)
+            if self._is_bufferable(habit, data, local_day):
+                return self.write_buffer.add(
+                    habit=habit,
+                    local_day=local_day,
+                    date=moment,
+                    quantity=data.quantity,
+                )
+            log = await self.uow.habit_logs.add_one(
+                {
+                    **data.model_dump(exclude_none=True),
+                    "habit_id": habit.uuid,
+                    "date": moment,
+                    "local_day": local_day,
+                }
+            )
+            await self.uow.habit_daily_stats.increment(
+                habit=habit,
+                day=log.local_day,
+                is_completed=log.is_completed,
+                quantity=log.quantity,
+            )
+            await self.uow.commit()
+            return log
+
+    async def delete_habit(self, habit_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+        """
+        Удаляет привычку вместе с отметками и агрегатами.
+
+        :param habit_id: UUID привычки.
+        :param user_id: UUID владельца привычки.
+        :return: True при успешном удалении.
+        """
+        if self.write_buffer is not None:
+            await self.write_buffer.flush()
+        async with self.uow:
+            await self.uow.habits.find_one({"uuid": habit_id, "user_id": user_id})
+            await self.uow.habits.delete_with_id(habit_id)
+            await self.uow.commit()
+        if self.write_buffer is not None:
+            self.write_buffer.discard(habit_id)
+        return True
+
+    async def delete_log(
+        self, habit_id: uuid.UUID, log_id: uuid.UUID, user_id: uuid.UUID
+    ) -> bool:
+        """
+        Удаляет отметку и пересчитывает дневной агрегат за её день.
+
+        :param habit_id: UUID привычки.
+        :param log_id: UUID отметки.
+        :param user_id: UUID владельца привычки.
+        :return: True при успешном удалении.
+        """
+        if self.write_buffer is not None:
+            await self.write_buffer.flush()
+        async with self.uow:
+            await self.uow.habits.find_one({"uuid": habit_id, "user_id": user_id})
+            log = await self.uow.habit_logs.find_one(
+                {"uuid": log_id, "habit_id": habit_id}
+            )
+            await self.uow.habit_logs.delete_with_id(log_id)
+            await self.uow.habit_daily_stats.rebuild_days(
+                habit_id=habit_id, days=[log.local_day]
+            )
+            await self.uow.commit()
+        return True
+
+    async def get_stats(
+        self,
+        habit_id: uuid.UUID,
+        user_id: uuid.UUID,
+        period: StatsPeriod,
+        date_from: datetime.date,
+        date_to: datetime.date,
+    ) -> List[HabitPeriodStat]:
+        """
+        Возвращает агрегированную статистику привычки из таблицы дневных агрегатов.
+
+        :param habit_id: UUID привычки.
+        :param user_id: UUID владельца привычки.
+        :param period: Период группировки ("day" или "week").
+        :param date_from: Начало диапазона (включительно).
+        :param date_to: Конец диапазона (включительно).
+        :return: Список агрегатов по периодам.
+        """
+        if date_from > date_to:
+            raise BadRequestException("date_from не может быть больше date_to.")
+        async with self.uow:
+            habit = await self.uow.habits.find_one(
+                {"uuid": habit_id, "user_id": user_id}
+            )
+            stats = await self.uow.habit_daily_stats.aggregate(
+                habit_id=habit_id,
+                period=period,
+                date_from=date_from,
+                date_to=date_to,
+            )
+            pending = [
+                item
+                for item in self._pending_for(habit_id)
+                if date_from <= item.local_day <= date_to
+            ]
+            if not pending:
+                return stats
+            days = await self.uow.habit_daily_stats.find_days(
+                habit_id=habit_id, days=[item.local_day for item in pending]
+            )
+        return self._merge_pending_stats(habit, period, stats, days, pending)
+
+    async def get_logs(
+        self,
+        habit_id: uuid.UUID,
+        user_id: uuid.UUID,
+        date_from: datetime.date,
+        date_to: datetime.date,
+    ) -> List[HabitLogRead]:
+        """
+        Возвращает отметки привычки за диапазон локальных дней пользователя.
+
+        :param habit_id: UUID привычки.
+        :param user_id: UUID владельца привычки.
+        :param date_from: Первый локальный день (включительно).
+        :param date_to: Последний локальный день (включительно).
+        :return: Список отметок.
+        """
+        if date_from > date_to:
+            raise BadRequestException("date_from не может быть больше date_to.")
+        async with self.uow:
+            await self.uow.habits.find_one({"uuid": habit_id, "user_id": user_id})
+            logs = await self.uow.habit_logs.find_for_days(
+                habit_id=habit_id, date_from=date_from, date_to=date_to
+            )
+        pending = [
+            item.to_read_model()
+            for item in self._pending_for(habit_id)
+            if date_from <= item.local_day <= date_to
+        ]
+        if not pending:
+            return logs
+        return sorted(logs + pending, key=lambda log: as_utc(log.date))
+
+    def _is_bufferable(
+        self, habit: HabitRead, data: HabitLogCreate, local_day: datetime.date
+    ) -> bool:
+        """Можно ли отложить запись отметки в буфер."""
+        return (
+            self.write_buffer is not None
+            and habit.is_quantifiable
+            and data.is_completed is None
+            and data.quantity is not None
+            and self.write_buffer.has_room(habit.uuid, local_day)
+        )
+
+    def _pending_for(self, habit_id: uuid.UUID) -> List[PendingIncrement]:
+        """Несохранённые приращения привычки из буфера."""
+        if self.write_buffer is None:
+            return []
+        return self.write_buffer.pending_for(habit_id)
+
+    @staticmethod
+    def _merge_pending_stats(
+        habit: HabitRead,
+        period: StatsPeriod,
+        stats: List[HabitPeriodStat],
+        days: List[HabitDailyStatRead],
+        pending: List[PendingIncrement],
+    ) -> List[HabitPeriodStat]:
+        """
+        Добавляет к агрегатам из БД несохранённые приращения из буфера.
+
+        :param habit: Привычка.
+        :param period: Период группировки.
+        :param stats: Агрегаты по периодам из БД.
+        :param days: Дневные агрегаты из БД за дни с приращениями.
+        :param pending: Несохранённые приращения.
+        :return: Агрегаты по периодам с учётом приращений.
+        """
+        by_period: Dict[datetime.date, HabitPeriodStat] = {
+            stat.period_start: stat.model_copy() for stat in stats
+        }
+        stored = {day.day: (day.quantity_sum, day.target_hit) for day in days}
+        target = habit.target_quantity
+        for item in pending:
+            if period == "week":
+                start = item.local_day - datetime.timedelta(
+                    days=item.local_day.weekday()
+                )
+            else:
+                start = item.local_day
+            stat = by_period.setdefault(
+                start,
+                HabitPeriodStat(
+                    period_start=start,
+                    completed_days=0,
+                    target_hit_days=0,
+                    quantity_sum=0,
+                    logs_count=0,
+                ),
+            )
+            quantity_sum, was_hit = stored.get(item.local_day, (0, False))
+            quantity_sum += item.quantity
+            is_hit = was_hit or (target is not None and quantity_sum >= target)
+            stored[item.local_day] = (quantity_sum, is_hit)
+            stat.quantity_sum += item.quantity
+            stat.logs_count += 1
+            stat.target_hit_days += int(is_hit and not was_hit)
+        return [by_period[start] for start in sorted(by_period)]
@@ -0,0 +1,149 @@
+import argparse
+import asyncio
+import uuid
+
+from app.core.logger import logger
+from app.core.repositories.sqlalchemy.shards import ShardRouter
+from app.core.settings import settings
+
+
+class RebalanceService:
+    """Перенос данных пользователей между шардами.
+
+    После изменения списка шардов часть пользователей отображается на новый
+    шард, а их данные остаются на старом. Сервис находит таких пользователей
+    и переносит их строки. Запускать следует при остановленной записи
+    (окно обслуживания), так как маршрутизация переключается сразу.
+    """
+
+    def __init__(
+        self, shard_router: ShardRouter, batch_size: int = settings.rollup_batch_size
+    ):
+        """
+        Инициализация сервиса.
+
+        :param shard_router: Маршрутизатор шардов.
+        :param batch_size: Количество пользователей, читаемых за один запрос.
+        """
+        self.shard_router = shard_router
+        self.batch_size = batch_size
+
+    async def move_user(self, user_id: uuid.UUID, source: int, target: int) -> None:
+        """
+        Переносит строки пользователя с шарда `source` на шард `target`.
+
+        Сначала данные фиксируются на целевом шарде, затем удаляются с
+        исходного; при сбое между шагами перенос можно повторить.
+
+        :param user_id: UUID пользователя.
+        :param source: Номер исходного шарда.
+        :param target: Номер целевого шарда.
+        """
+        source_uow = self.shard_router.uow_for_shard(source)
+        async with source_uow:
+            rows = await source_uow.users.export_user_rows(user_id)
+
+        target_uow = self.shard_router.uow_for_shard(target)
+        async with target_uow:
+            await target_uow.users.import_user_rows(rows)
+            await target_uow.commit()
+
+        source_uow = self.shard_router.uow_for_shard(source)
+        async with source_uow:
+            await source_uow.users.delete_user_rows(user_id)
+            await source_uow.commit()
+
+    async def rebalance_shard(self, shard: int, dry_run: bool = False) -> int:
+        """
+        Переносит с шарда всех пользователей, которые ему больше не принадлежат.
+
+        :param shard: Номер шарда.
+        :param dry_run: Только подсчитать пользователей, не перенося их.
+        :return: Количество перенесённых (найденных) пользователей.
+        """
+        moved = 0
+        last_uuid = None
+        while True:
+            uow = self.shard_router.uow_for_shard(shard)
+            async with uow:
+                chunk = await uow.users.get_uuid_chunk(
+                    after=last_uuid, limit=self.batch_size
+                )
+            if not chunk:
+                return moved
+            for user_id in chunk:
+                target = self.shard_router.shard_for(user_id)
+                if target == shard:
+                    continue
+                if not dry_run:
+                    await self.move_user(user_id, source=shard, target=target)
+                moved += 1
+            last_uuid = chunk[-1]
+
+    async def rebalance(self, dry_run: bool = False) -> int:
+        """
+        Перебалансирует все шарды параллельно.
+
+        :param dry_run: Только подсчитать пользователей, не перенося их.
+        :return: Общее количество перенесённых (найденных) пользователей.
+        """
+        moved = await asyncio.gather(
+            *(
+                self.rebalance_shard(shard, dry_run=dry_run)
+                for shard in range(self.shard_router.shards_count)
+            )
+        )
+        return sum(moved)
+
+    async def rebuild_directory(self) -> int:
+        """
+        Дополняет справочник логинов пользователями всех шардов
+        (уже записанные логины пропускаются).
+
+        :return: Количество просмотренных пользователей.
+        """
+        processed = 0
+        for shard in range(self.shard_router.shards_count):
+            last_uuid = None
+            while True:
+                uow = self.shard_router.uow_for_shard(shard)
+                async with uow:
+                    chunk = await uow.users.get_login_chunk(
+                        after=last_uuid, limit=self.batch_size
+                    )
+                if not chunk:
+                    break
+                directory_uow = self.shard_router.directory_uow()
+                async with directory_uow:
+                    await directory_uow.login_directory.add_missing(chunk)
+                    await directory_uow.commit()
+                processed += len(chunk)
+                last_uuid = chunk[-1]["uuid"]
+        return processed
+
+
+async def main(dry_run: bool, directory: bool) -> None:
+    """Точка входа перебалансировки шардов."""
+    shard_router = ShardRouter.from_settings()
+    service = RebalanceService(shard_router)
+    try:
+        if directory:
+            processed = await service.rebuild_directory()
+            logger.info(f"Login directory rebuilt, users processed: {processed}")
+            return
+        moved = await service.rebalance(dry_run=dry_run)
+    finally:
+        await shard_router.dispose()
+    logger.info(f"Rebalance finished, users to move: {moved}, dry run: {dry_run}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move users to their shards.")
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument(
+        "--directory",
+        action="store_true",
+        help="Fill the login directory from the users of all shards.",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.dry_run, args.directory))
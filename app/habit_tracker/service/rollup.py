@@ -0,0 +1,94 @@
+import asyncio
+import uuid
+from typing import List
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.logger import logger
+from app.core.repositories.sqlalchemy.shards import ShardRouter
+from app.core.repositories.sqlalchemy.uow import UnitOfWork
+from app.core.settings import settings
+
+
+class RollupService:
+    """Полный пересчёт таблицы дневных агрегатов `habit_daily_stats`.
+
+    Пользователи обходятся порциями по UUID (keyset), каждая порция
+    пересчитывается в отдельной транзакции; одновременно обрабатывается
+    не более `concurrency` порций.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        batch_size: int = settings.rollup_batch_size,
+        concurrency: int = settings.rollup_concurrency,
+    ):
+        """
+        Инициализация сервиса пересчёта.
+
+        :param session_factory: Фабрика асинхронных сессий.
+        :param batch_size: Количество пользователей в одной порции.
+        :param concurrency: Максимальное число одновременно пересчитываемых порций.
+        """
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+
+    async def rebuild_all(self) -> int:
+        """
+        Пересчитывает агрегаты всех пользователей.
+
+        :return: Количество обработанных пользователей.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks: List[asyncio.Task] = []
+        processed = 0
+        last_uuid = None
+        while True:
+            chunk = await self._next_chunk(last_uuid)
+            if not chunk:
+                break
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(self._rebuild_chunk(chunk, semaphore)))
+            processed += len(chunk)
+            last_uuid = chunk[-1]
+        await asyncio.gather(*tasks)
+        return processed
+
+    async def _next_chunk(self, after: uuid.UUID | None) -> List[uuid.UUID]:
+        """Читает очередную порцию UUID пользователей."""
+        uow = UnitOfWork(self.session_factory)
+        async with uow:
+            return await uow.users.get_uuid_chunk(after=after, limit=self.batch_size)
+
+    async def _rebuild_chunk(
+        self, user_ids: List[uuid.UUID], semaphore: asyncio.Semaphore
+    ) -> None:
+        """Пересчитывает агрегаты порции пользователей в одной транзакции."""
+        try:
+            uow = UnitOfWork(self.session_factory)
+            async with uow:
+                await uow.habit_daily_stats.rebuild_for_users(user_ids)
+                await uow.commit()
+        finally:
+            semaphore.release()
+
+
+async def main() -> None:
+    """Точка входа ночного пересчёта агрегатов: шарды обрабатываются параллельно."""
+    shard_router = ShardRouter.from_settings()
+    try:
+        processed = await asyncio.gather(
+            *(
+                RollupService(session_maker).rebuild_all()
+                for session_maker in shard_router.session_makers
+            )
+        )
+    finally:
+        await shard_router.dispose()
+    logger.info(f"Rollup rebuild finished, users processed: {sum(processed)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
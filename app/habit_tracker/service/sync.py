@@ -0,0 +1,107 @@
+import datetime
+import uuid
+from typing import Optional
+
+from app.core.repositories.abc_uow import AbstractUnitOfWork
+from app.habit_tracker.entity.sync import (
+    HabitLogsSyncPage,
+    HabitsSyncPage,
+    SyncCursor,
+    TombstonesSyncPage,
+)
+from app.habit_tracker.service.utils import to_naive_utc
+
+
+class SyncService:
+    """Дельта-синхронизация клиентов по водяному знаку `(updated_at, uuid)`.
+
+    Клиент хранит курсор последней полученной записи отдельно для привычек,
+    отметок и удалений и запрашивает только записи после него. Изменения
+    попадают в выдачу с задержкой `sync_safety_lag_seconds`.
+    """
+
+    def __init__(self, uow: AbstractUnitOfWork):
+        """
+        Инициализация сервиса с использованием Unit of Work.
+
+        :param uow: Абстрактный класс для работы с репозиторием и транзакциями.
+        """
+        self.uow = uow
+
+    async def sync_habits(
+        self,
+        user_id: uuid.UUID,
+        updated_after: Optional[datetime.datetime],
+        after_uuid: Optional[uuid.UUID],
+        limit: int,
+    ) -> HabitsSyncPage:
+        """
+        Возвращает привычки, изменённые после курсора.
+
+        :param user_id: UUID пользователя.
+        :param updated_after: `updated_at` последней полученной записи.
+        :param after_uuid: UUID последней полученной записи.
+        :param limit: Размер страницы.
+        :return: Страница изменений.
+        """
+        async with self.uow:
+            items, cursor, has_more = await self.uow.habits.find_changed(
+                user_id, self._cursor(updated_after, after_uuid), limit
+            )
+        return HabitsSyncPage(items=items, cursor=cursor, has_more=has_more)
+
+    async def sync_logs(
+        self,
+        user_id: uuid.UUID,
+        updated_after: Optional[datetime.datetime],
+        after_uuid: Optional[uuid.UUID],
+        limit: int,
+    ) -> HabitLogsSyncPage:
+        """
+        Возвращает отметки, изменённые после курсора.
+
+        :param user_id: UUID пользователя.
+        :param updated_after: `updated_at` последней полученной записи.
+        :param after_uuid: UUID последней полученной записи.
+        :param limit: Размер страницы.
+        :return: Страница изменений.
+        """
+        async with self.uow:
+            items, cursor, has_more = await self.uow.habit_logs.find_changed(
+                user_id, self._cursor(updated_after, after_uuid), limit
+            )
+        return HabitLogsSyncPage(items=items, cursor=cursor, has_more=has_more)
+
+    async def sync_tombstones(
+        self,
+        user_id: uuid.UUID,
+        updated_after: Optional[datetime.datetime],
+        after_uuid: Optional[uuid.UUID],
+        limit: int,
+    ) -> TombstonesSyncPage:
+        """
+        Возвращает удаления, произошедшие после курсора.
+
+        :param user_id: UUID пользователя.
+        :param updated_after: `updated_at` последней полученной записи.
+        :param after_uuid: UUID последней полученной записи.
+        :param limit: Размер страницы.
+        :return: Страница удалений.
+        """
+        async with self.uow:
+            items, cursor, has_more = await self.uow.tombstones.find_changed(
+                user_id, self._cursor(updated_after, after_uuid), limit
+            )
+        return TombstonesSyncPage(items=items, cursor=cursor, has_more=has_more)
+
+    @staticmethod
+    def _cursor(
+        updated_after: Optional[datetime.datetime], after_uuid: Optional[uuid.UUID]
+    ) -> Optional[SyncCursor]:
+        """Строит курсор из параметров запроса; без `updated_after` — все записи."""
+        if updated_after is None:
+            return None
+        return SyncCursor(
+            updated_at=to_naive_utc(updated_after),
+            uuid=after_uuid or uuid.UUID(int=0),
+        )
@@ -0,0 +1,44 @@
+import uuid
+
+from app.core.repositories.abc_uow import AbstractUnitOfWork
+from app.habit_tracker.entity.users import UserRead, UserTimezoneUpdate
+from app.habit_tracker.service.utils import get_zone
+
+
+class UsersService:
+    def __init__(self, uow: AbstractUnitOfWork):
+        """
+        Инициализация сервиса с использованием Unit of Work.
+
+        :param uow: Абстрактный класс для работы с репозиторием и транзакциями.
+        """
+        self.uow = uow
+
+    async def get_user(self, user_id: uuid.UUID) -> UserRead:
+        """
+        Возвращает пользователя по UUID.
+
+        :param user_id: UUID пользователя.
+        :return: Пользователь.
+        """
+        async with self.uow:
+            return await self.uow.users.find_one({"uuid": user_id})
+
+    async def set_timezone(
+        self, user_id: uuid.UUID, data: UserTimezoneUpdate
+    ) -> UserRead:
+        """
+        Устанавливает часовой пояс пользователя.
+
+        Уже записанные отметки сохраняют вычисленный ранее локальный день.
+
+        :param user_id: UUID пользователя.
+        :param data: Новый часовой пояс.
+        :return: Обновлённый пользователь.
+        """
+        get_zone(data.timezone)
+        async with self.uow:
+            await self.uow.users.edit_one(user_id, {"timezone": data.timezone})
+            user = await self.uow.users.find_one({"uuid": user_id})
+            await self.uow.commit()
+            return user
@@ -0,0 +1,51 @@
+import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.core.exc import BadRequestException
+
+
+def get_zone(tz_name: str) -> ZoneInfo:
+    """
+    Возвращает часовой пояс по IANA-имени.
+
+    :param tz_name: Имя часового пояса, например "Europe/Moscow".
+    :return: Объект часового пояса.
+    :raises BadRequestException: Если часовой пояс неизвестен.
+    """
+    try:
+        return ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise BadRequestException(f"Неизвестный часовой пояс: {tz_name}.")
+
+
+def as_utc(moment: datetime.datetime) -> datetime.datetime:
+    """
+    Приводит момент времени к UTC; наивные значения считаются заданными в UTC.
+
+    :param moment: Момент времени.
+    :return: Момент времени с часовым поясом UTC.
+    """
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=datetime.UTC)
+    return moment.astimezone(datetime.UTC)
+
+
+def to_naive_utc(moment: datetime.datetime) -> datetime.datetime:
+    """
+    Приводит момент времени к наивному UTC для сравнения с `updated_at`.
+
+    :param moment: Момент времени.
+    :return: Наивный момент времени в UTC.
+    """
+    return as_utc(moment).replace(tzinfo=None)
+
+
+def to_local_day(moment: datetime.datetime, tz_name: str) -> datetime.date:
+    """
+    Вычисляет день момента времени в часовом поясе пользователя.
+
+    :param moment: Момент времени.
+    :param tz_name: Имя часового пояса пользователя.
+    :return: Локальная дата.
+    """
+    return as_utc(moment).astimezone(get_zone(tz_name)).date()
@@ -0,0 +1,329 @@
+import asyncio
+import datetime
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.exc import AlreadyExists, NotFoundError
+from app.core.logger import logger
+from app.core.repositories.sqlalchemy.shards import ShardRouter
+from app.core.settings import settings
+from app.habit_tracker.entity.habits import HabitLogRead, HabitRead
+from app.habit_tracker.repositories.sqlalchemy.repositories import StatIncrement
+
+BufferKey = Tuple[uuid.UUID, datetime.date]
+
+# Ошибки, которые не исчезнут при повторной записи (например, привычка удалена)
+PERMANENT_ERRORS = (IntegrityError, AlreadyExists, NotFoundError)
+
+
+@dataclass
+class PendingIncrement:
+    """Накопленное, ещё не записанное в БД приращение количества за день."""
+
+    habit: HabitRead
+    local_day: datetime.date
+    date: datetime.datetime
+    quantity: float = 0
+    log_uuid: uuid.UUID = field(default_factory=uuid.uuid4)
+    attempts: int = 0
+
+    def to_read_model(self) -> HabitLogRead:
+        """Представление приращения в виде отметки привычки."""
+        return HabitLogRead(
+            uuid=self.log_uuid,
+            habit_id=self.habit.uuid,
+            date=self.date,
+            local_day=self.local_day,
+            is_completed=None,
+            quantity=self.quantity,
+        )
+
+
+class QuantityWriteBuffer:
+    """Буфер отложенной записи количественных отметок.
+
+    Приращения одной привычки за один локальный день сливаются в памяти и
+    записываются одной отметкой и одним upsert дневного агрегата (по одной
+    транзакции на шард). Сброс выполняется раз в `flush_interval_ms` или при
+    накоплении `max_items` ключей, а также при остановке приложения; так окно
+    потери ограничено интервалом сброса.
+
+    Буфер не принимает больше `max_pending` ключей: при заполнении отметки
+    пишутся напрямую. Приращение, отвергнутое БД (например, для удалённой
+    привычки), отбрасывается, а при временных ошибках повторяется не более
+    `max_attempts` раз, поэтому одна плохая запись не блокирует остальные.
+    """
+
+    def __init__(
+        self,
+        shard_router: ShardRouter,
+        flush_interval_ms: int = settings.write_buffer_flush_interval_ms,
+        max_items: int = settings.write_buffer_max_items,
+        max_pending: int = settings.write_buffer_max_pending,
+        max_attempts: int = settings.write_buffer_max_attempts,
+    ):
+        """
+        Инициализация буфера.
+
+        :param shard_router: Маршрутизатор шардов.
+        :param flush_interval_ms: Максимальное время жизни приращения в буфере.
+        :param max_items: Количество ключей `(habit_id, day)`, вызывающее сброс.
+        :param max_pending: Предельное количество ключей в буфере.
+        :param max_attempts: Количество попыток записи приращения.
+        """
+        self.shard_router = shard_router
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_items = max_items
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self._pending: Dict[BufferKey, PendingIncrement] = {}
+        self._flushing: Dict[BufferKey, PendingIncrement] = {}
+        self._discarded: Set[uuid.UUID] = set()
+        self._flush_lock = asyncio.Lock()
+        self._full = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Запускает фоновый цикл сброса."""
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Останавливает фоновый цикл и сбрасывает оставшиеся приращения.
+
+        Цикл не отменяется, а завершается после текущего сброса, чтобы
+        записываемая в этот момент порция не потерялась.
+        """
+        if self._task is not None:
+            self._stopping.set()
+            self._full.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def has_room(self, habit_id: uuid.UUID, local_day: datetime.date) -> bool:
+        """
+        Проверяет, примет ли буфер приращение.
+
+        :param habit_id: UUID привычки.
+        :param local_day: Локальный день отметки.
+        :return: True, если ключ уже в буфере или лимит не исчерпан.
+        """
+        if (habit_id, local_day) in self._pending:
+            return True
+        return len(self._pending) + len(self._flushing) < self.max_pending
+
+    def add(
+        self,
+        habit: HabitRead,
+        local_day: datetime.date,
+        date: datetime.datetime,
+        quantity: float,
+    ) -> HabitLogRead:
+        """
+        Добавляет приращение количества в буфер.
+
+        Ответ совпадает с ответом прямой записи: отметка с присланным
+        количеством. Её `uuid` — UUID дневной отметки, в которую приращение
+        будет слито при сбросе.
+
+        :param habit: Привычка.
+        :param local_day: Локальный день отметки.
+        :param date: Момент отметки.
+        :param quantity: Приращение количества.
+        :return: Отметка с добавленным приращением.
+        """
+        key = (habit.uuid, local_day)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = PendingIncrement(
+                habit=habit, local_day=local_day, date=date
+            )
+        pending.quantity += quantity
+        pending.date = max(pending.date, date)
+        if len(self._pending) >= self.max_items:
+            self._full.set()
+        return HabitLogRead(
+            uuid=pending.log_uuid,
+            habit_id=habit.uuid,
+            date=date,
+            local_day=local_day,
+            is_completed=None,
+            quantity=quantity,
+        )
+
+    def pending_for(self, habit_id: uuid.UUID) -> List[PendingIncrement]:
+        """
+        Возвращает приращения привычки, ещё не зафиксированные в БД
+        (включая записываемые в данный момент).
+
+        :param habit_id: UUID привычки.
+        :return: Список приращений.
+        """
+        return [
+            pending
+            for source in (self._flushing, self._pending)
+            for (pending_habit_id, _), pending in source.items()
+            if pending_habit_id == habit_id
+        ]
+
+    def discard(self, habit_id: uuid.UUID) -> None:
+        """
+        Отбрасывает несброшенные приращения удалённой привычки.
+
+        Приращения, записываемые в этот момент, убираются из списка
+        записываемых и при неудачной записи не возвращаются в буфер.
+
+        :param habit_id: UUID привычки.
+        """
+        for key in [key for key in self._pending if key[0] == habit_id]:
+            del self._pending[key]
+        flushing = [key for key in self._flushing if key[0] == habit_id]
+        if flushing:
+            self._discarded.add(habit_id)
+        for key in flushing:
+            del self._flushing[key]
+
+    async def flush(self) -> None:
+        """Записывает накопленные приращения, по одной транзакции на шард."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            self._flushing = dict(batch)
+            by_shard: Dict[int, Dict[BufferKey, PendingIncrement]] = {}
+            for key, pending in batch.items():
+                shard = self.shard_router.shard_for(pending.habit.user_id)
+                by_shard.setdefault(shard, {})[key] = pending
+            try:
+                await asyncio.gather(
+                    *(
+                        self._flush_shard(shard, items)
+                        for shard, items in by_shard.items()
+                    )
+                )
+            finally:
+                self._discarded.clear()
+
+    async def _flush_shard(
+        self, shard: int, batch: Dict[BufferKey, PendingIncrement]
+    ) -> None:
+        """
+        Записывает приращения одного шарда одной транзакцией.
+
+        Если БД отвергла порцию, приращения записываются по одному, чтобы
+        отбросить только ошибочные; при временной ошибке порция
+        возвращается в буфер.
+        """
+        try:
+            await self._write(shard, batch)
+        except asyncio.CancelledError:
+            self._requeue(self._take_flushing(batch))
+            raise
+        except PERMANENT_ERRORS:
+            if len(batch) > 1:
+                for key, pending in batch.items():
+                    if self._flushing.get(key) is pending:
+                        await self._flush_shard(shard, {key: pending})
+                return
+            for key in self._take_flushing(batch):
+                logger.exception(
+                    f"Write buffer dropped increment {key} rejected by the DB"
+                )
+        except Exception:
+            batch = self._take_flushing(batch)
+            logger.exception(
+                f"Write buffer flush of {len(batch)} increments on shard {shard} "
+                "failed, increments requeued"
+            )
+            self._retry(batch)
+
+    async def _write(
+        self, shard: int, batch: Dict[BufferKey, PendingIncrement]
+    ) -> None:
+        """Пишет отметки и дневные агрегаты порции в транзакции шарда."""
+        uow = self.shard_router.uow_for_shard(shard)
+        async with uow:
+            await uow.habit_logs.add_many(
+                [
+                    {
+                        "uuid": pending.log_uuid,
+                        "habit_id": pending.habit.uuid,
+                        "date": pending.date,
+                        "local_day": pending.local_day,
+                        "quantity": pending.quantity,
+                    }
+                    for pending in batch.values()
+                ]
+            )
+            await uow.habit_daily_stats.increment_many(
+                [
+                    StatIncrement(
+                        habit=pending.habit,
+                        day=pending.local_day,
+                        is_completed=False,
+                        quantity=pending.quantity,
+                    )
+                    for pending in batch.values()
+                ]
+            )
+            await uow.commit()
+            # Сразу после фиксации строки уже видны в БД: убираем порцию из
+            # записываемых до закрытия сессии, чтобы чтения не учли её дважды.
+            self._take_flushing(batch)
+
+    def _take_flushing(
+        self, batch: Dict[BufferKey, PendingIncrement]
+    ) -> Dict[BufferKey, PendingIncrement]:
+        """
+        Убирает приращения порции из списка записываемых.
+
+        :param batch: Порция приращений.
+        :return: Приращения, которые ещё числились записываемыми (не
+            зафиксированы и не отброшены).
+        """
+        taken = {}
+        for key, pending in batch.items():
+            if self._flushing.get(key) is pending:
+                taken[key] = self._flushing.pop(key)
+        return taken
+
+    def _retry(self, batch: Dict[BufferKey, PendingIncrement]) -> None:
+        """Возвращает порцию в буфер, отбрасывая исчерпавшие попытки."""
+        for key, pending in batch.items():
+            pending.attempts += 1
+            if pending.attempts >= self.max_attempts:
+                logger.error(
+                    f"Write buffer dropped increment {key} "
+                    f"after {pending.attempts} attempts"
+                )
+                continue
+            self._requeue({key: pending})
+
+    def _requeue(self, batch: Dict[BufferKey, PendingIncrement]) -> None:
+        """Возвращает несохранённые приращения в буфер."""
+        for key, pending in batch.items():
+            if key[0] in self._discarded:
+                continue
+            current = self._pending.get(key)
+            if current is None:
+                self._pending[key] = pending
+                continue
+            pending.quantity += current.quantity
+            pending.date = max(pending.date, current.date)
+            self._pending[key] = pending
+
+    async def _run(self) -> None:
+        """Фоновый цикл сброса по таймеру или заполнению буфера."""
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+            await self.flush()
@@ -4,28 +4,40 @@ from typing import AsyncIterator
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
-from sqlalchemy import NullPool
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 
+from app.core.repositories.sqlalchemy.shards import ShardRouter
+from app.core.security import PasswordHasher
 from app.core.settings import settings
+from app.habit_tracker.api.endpoints.auth import router as router_auth
 from app.habit_tracker.api.endpoints.habits import router as router_habits
+from app.habit_tracker.api.endpoints.sync import router as router_sync
+from app.habit_tracker.api.endpoints.users import router as router_users
+from app.habit_tracker.service.write_buffer import QuantityWriteBuffer
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Evnet on start app."""
     # Postgres
-    if settings.mode == "prod":
-        engine = create_async_engine(settings.database_url)
-    else:
-        engine = create_async_engine(settings.test_database_url, poolclass=NullPool)
-
-    app.state.pg_async_session_maker = async_sessionmaker(
-        engine, expire_on_commit=False
+    app.state.shard_router = ShardRouter.from_settings()
+    app.state.password_hasher = PasswordHasher(
+        n=settings.password_scrypt_n,
+        r=settings.password_scrypt_r,
+        p=settings.password_scrypt_p,
+        max_workers=settings.password_hash_workers,
     )
+    app.state.write_buffer = None
+    if settings.write_buffer_enabled:
+        app.state.write_buffer = QuantityWriteBuffer(app.state.shard_router)
+        app.state.write_buffer.start()
     print("Application lifespan started.")
     yield
+    if app.state.write_buffer is not None:
+        await app.state.write_buffer.stop()
+    app.state.password_hasher.shutdown()
+    await app.state.shard_router.dispose()
     print("Application lifespan finished.")
 
 
@@ -42,7 +54,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
-for router in [router_habits]:
+for router in [router_auth, router_habits, router_sync, router_users]:
     app.include_router(router, prefix="/api/v1")
 
 app.add_middleware(
@@ -56,3 +68,4 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_minimum_size)
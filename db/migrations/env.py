@@ -8,7 +8,6 @@ from app.core.settings import settings
 from app.habit_tracker.repositories.sqlalchemy.models import *  # noqa: F403
 
 config = context.config
-config.set_main_option("sqlalchemy.url", f"{settings.database_url}?async_fallback=True")
 
 
 if config.config_file_name is not None:
@@ -18,6 +17,15 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+def shard_urls() -> list[str]:
+    """Url databases to migrate: every shard, or one chosen with `-x shard=N`."""
+    urls = settings.shard_urls
+    shard = context.get_x_argument(as_dictionary=True).get("shard")
+    if shard is not None:
+        urls = [urls[int(shard)]]
+    return [f"{url}?async_fallback=True" for url in urls]
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -29,10 +37,11 @@ def run_migrations_offline() -> None:
     Calls to context.execute() here emit the given string to the
     script output.
 
+    All shards share one schema, so the script is emitted once.
+
     """
-    url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url,
+        url=shard_urls()[0],
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
@@ -48,18 +57,22 @@ def run_migrations_online() -> None:
     In this scenario we need to create an Engine
     and associate a connection with the context.
 
-    """
-    connectable = engine_from_config(
-        config.get_section(config.config_ini_section, {}),
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
-
-    with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+    Shards are migrated one after another in shard order.
 
-        with context.begin_transaction():
-            context.run_migrations()
+    """
+    for url in shard_urls():
+        config.set_main_option("sqlalchemy.url", url)
+        connectable = engine_from_config(
+            config.get_section(config.config_ini_section, {}),
+            prefix="sqlalchemy.",
+            poolclass=pool.NullPool,
+        )
+
+        with connectable.connect() as connection:
+            context.configure(connection=connection, target_metadata=target_metadata)
+
+            with context.begin_transaction():
+                context.run_migrations()
 
 
 if context.is_offline_mode():
@@ -0,0 +1,54 @@
+"""habit daily stats rollup table
+
+Revision ID: 3f1c2a9b7d01
+Revises: 1b6d0c3e9a40
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c2a9b7d01"
+down_revision: Union[str, None] = "1b6d0c3e9a40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "habit_daily_stats",
+        sa.Column("uuid", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("habit_id", sa.Uuid(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("is_completed", sa.Boolean(), nullable=False),
+        sa.Column("quantity_sum", sa.Float(), nullable=False),
+        sa.Column("logs_count", sa.Integer(), nullable=False),
+        sa.Column("target_hit", sa.Boolean(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["habit_id"], ["habits.uuid"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.uuid"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("uuid"),
+        sa.UniqueConstraint("habit_id", "day"),
+    )
+    op.create_index(
+        op.f("ix_habit_daily_stats_user_id"),
+        "habit_daily_stats",
+        ["user_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_habit_daily_stats_user_id"), table_name="habit_daily_stats")
+    op.drop_table("habit_daily_stats")
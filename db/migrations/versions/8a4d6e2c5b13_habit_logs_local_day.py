@@ -0,0 +1,96 @@
+"""user timezone and habit_logs.local_day
+
+Revision ID: 8a4d6e2c5b13
+Revises: 3f1c2a9b7d01
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8a4d6e2c5b13"
+down_revision: Union[str, None] = "3f1c2a9b7d01"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_CHUNK_SIZE = 10_000
+
+# Порция выбирается по первичному ключу, а не по `local_day IS NULL`:
+# поиск следующей порции идёт по индексу PK и не сканирует таблицу заново.
+BACKFILL_CHUNK = sa.text(
+    """
+    WITH chunk AS (
+        SELECT uuid FROM habit_logs
+        WHERE uuid > CAST(:last AS uuid)
+        ORDER BY uuid
+        LIMIT :limit
+    ),
+    updated AS (
+        UPDATE habit_logs AS l
+        SET local_day = (l.date AT TIME ZONE u.timezone)::date
+        FROM habits AS h
+        JOIN users AS u ON u.uuid = h.user_id
+        WHERE h.uuid = l.habit_id
+          AND l.uuid IN (SELECT uuid FROM chunk)
+    )
+    SELECT uuid FROM chunk ORDER BY uuid DESC LIMIT 1
+    """
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("timezone", sa.String(), server_default="UTC", nullable=False),
+    )
+    # Существующие значения хранились как наивное UTC-время.
+    # Смена типа переписывает всю таблицу habit_logs под блокировкой
+    # ACCESS EXCLUSIVE: на больших таблицах миграцию нужно запускать
+    # в окно обслуживания.
+    op.alter_column(
+        "habit_logs",
+        "date",
+        type_=sa.DateTime(timezone=True),
+        postgresql_using="date AT TIME ZONE 'UTC'",
+    )
+    op.add_column("habit_logs", sa.Column("local_day", sa.Date(), nullable=True))
+
+    # Заполняем local_day порциями по первичному ключу, каждая в своей
+    # транзакции, чтобы не держать блокировки строк на всей таблице.
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        last = str(uuid.UUID(int=0))
+        while True:
+            last = connection.execute(
+                BACKFILL_CHUNK, {"last": last, "limit": BACKFILL_CHUNK_SIZE}
+            ).scalar()
+            if last is None:
+                break
+
+    # Проверка NOT NULL сканирует таблицу (без перезаписи).
+    op.alter_column("habit_logs", "local_day", nullable=False)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_habit_logs_habit_id_local_day",
+            "habit_logs",
+            ["habit_id", "local_day"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_habit_logs_habit_id_local_day", table_name="habit_logs")
+    op.drop_column("habit_logs", "local_day")
+    op.alter_column(
+        "habit_logs",
+        "date",
+        type_=sa.DateTime(),
+        postgresql_using="date AT TIME ZONE 'UTC'",
+    )
+    op.drop_column("users", "timezone")
@@ -0,0 +1,67 @@
+"""sync watermark indexes and tombstones
+
+Revision ID: c7e91f4a2d58
+Revises: 8a4d6e2c5b13
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c7e91f4a2d58"
+down_revision: Union[str, None] = "8a4d6e2c5b13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tombstones",
+        sa.Column("uuid", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("entity_type", sa.String(), nullable=False),
+        sa.Column("entity_id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.uuid"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("uuid"),
+    )
+    op.create_index(
+        "ix_tombstones_user_id_updated_at_uuid",
+        "tombstones",
+        ["user_id", "updated_at", "uuid"],
+        unique=False,
+    )
+
+    # Индексы на существующих таблицах строим без блокировки записи.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_habits_user_id_updated_at_uuid",
+            "habits",
+            ["user_id", "updated_at", "uuid"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_habit_logs_habit_id_updated_at_uuid",
+            "habit_logs",
+            ["habit_id", "updated_at", "uuid"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_habit_logs_habit_id_updated_at_uuid", table_name="habit_logs")
+    op.drop_index("ix_habits_user_id_updated_at_uuid", table_name="habits")
+    op.drop_index("ix_tombstones_user_id_updated_at_uuid", table_name="tombstones")
+    op.drop_table("tombstones")
@@ -0,0 +1,44 @@
+"""global login directory
+
+Revision ID: e4a7b2c9d615
+Revises: c7e91f4a2d58
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a7b2c9d615"
+down_revision: Union[str, None] = "c7e91f4a2d58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Таблица создаётся на всех шардах (схема общая), а используется только на
+# шарде справочника. Логины уже зарегистрированных пользователей переносятся
+# командой `make rebuild_directory`.
+def upgrade() -> None:
+    op.create_table(
+        "login_directory",
+        sa.Column("uuid", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("uuid"),
+        sa.UniqueConstraint("email"),
+        sa.UniqueConstraint("username"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("login_directory")
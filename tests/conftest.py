@@ -0,0 +1,61 @@
+import asyncio
+import os
+from typing import Any, Awaitable, Callable
+
+import pytest
+from sqlalchemy import NullPool
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# Настройки приложения читаются при импорте модулей; для тестов без БД
+# достаточно заглушек обязательных значений.
+for name, value in {
+    "SECRET_KEY": "test-secret",
+    "MODE": "dev",
+    "DATABASE_USERNAME": "postgres",
+    "DATABASE_PASSWORD": "postgres",
+    "DATABASE_HOST": "localhost",
+    "DATABASE_PORT": "5432",
+    "DATABASE_NAME": "habits",
+    "TEST_DATABASE_USERNAME": "postgres",
+    "TEST_DATABASE_PASSWORD": "postgres",
+    "TEST_DATABASE_HOST": "localhost",
+    "TEST_DATABASE_PORT": "5432",
+    "TEST_DATABASE_NAME": "habits_test",
+}.items():
+    os.environ.setdefault(name, value)
+
+from app.core.repositories.sqlalchemy.base_model import Base  # noqa: E402
+from app.core.settings import settings  # noqa: E402
+from app.habit_tracker.repositories.sqlalchemy import models  # noqa: E402, F401
+
+Scenario = Callable[[async_sessionmaker], Awaitable[Any]]
+
+
+@pytest.fixture
+def db() -> Callable[[Scenario], Any]:
+    """
+    Запускает сценарий на пустой схеме тестовой БД (`TEST_DATABASE_*`).
+
+    Если БД недоступна, тест пропускается.
+    """
+
+    def run(scenario: Scenario) -> Any:
+        async def main() -> Any:
+            engine = create_async_engine(settings.test_database_url, poolclass=NullPool)
+            try:
+                try:
+                    async with engine.connect():
+                        pass
+                except (OSError, DBAPIError) as e:
+                    pytest.skip(f"Тестовая БД недоступна: {e}")
+                async with engine.begin() as connection:
+                    await connection.run_sync(Base.metadata.drop_all)
+                    await connection.run_sync(Base.metadata.create_all)
+                return await scenario(async_sessionmaker(engine, expire_on_commit=False))
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,174 @@
+import asyncio
+import uuid
+from typing import Dict, List
+
+import pytest
+
+from app.core.exc import AlreadyExists, IncorrectEmailOrPasswordException
+from app.core.security import PasswordHasher
+from app.core.utils import JWTHandler
+from app.habit_tracker.entity.auth import UserLogin, UserRegister
+from app.habit_tracker.entity.users import UserRead
+from app.habit_tracker.service.auth import AuthService
+
+SHARDS = 2
+
+
+class FakeLoginDirectory:
+    """Справочник логинов с уникальностью email и username."""
+
+    def __init__(self, rows: Dict[uuid.UUID, dict]):
+        self.rows = rows
+
+    async def add_one_nr(self, data: dict) -> bool:
+        for row in self.rows.values():
+            if row["email"] == data["email"] or row["username"] == data["username"]:
+                raise AlreadyExists()
+        self.rows[data["uuid"]] = data
+        return True
+
+    async def delete_with_id(self, user_id: uuid.UUID) -> bool:
+        del self.rows[user_id]
+        return True
+
+    async def find_user_id(self, email: str):
+        return next(
+            (key for key, row in self.rows.items() if row["email"] == email), None
+        )
+
+
+class FakeUsers:
+    def __init__(self, shard: "FakeShard"):
+        self.shard = shard
+
+    async def add_one(self, data: dict) -> UserRead:
+        if self.shard.broken:
+            raise ConnectionError("shard is down")
+        self.shard.users[data["uuid"]] = data
+        return UserRead(
+            uuid=data["uuid"],
+            username=data["username"],
+            email=data["email"],
+            timezone="UTC",
+        )
+
+    async def get_credentials(self, email: str):
+        for user in self.shard.users.values():
+            if user["email"] == email:
+                return user["uuid"], user["hashed_password"]
+        return None
+
+
+class FakeShard:
+    def __init__(self):
+        self.users: Dict[uuid.UUID, dict] = {}
+        self.directory: Dict[uuid.UUID, dict] = {}
+        self.broken = False
+
+
+class FakeUoW:
+    def __init__(self, shard: FakeShard):
+        self.users = FakeUsers(shard)
+        self.login_directory = FakeLoginDirectory(shard.directory)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def commit(self):
+        pass
+
+
+class FakeShardRouter:
+    def __init__(self):
+        self.shards: List[FakeShard] = [FakeShard() for _ in range(SHARDS)]
+
+    def shard_for(self, user_id: uuid.UUID) -> int:
+        return user_id.int % SHARDS
+
+    def uow_for(self, user_id: uuid.UUID) -> FakeUoW:
+        return FakeUoW(self.shards[self.shard_for(user_id)])
+
+    def uow_for_shard(self, shard: int) -> FakeUoW:
+        return FakeUoW(self.shards[shard])
+
+    def directory_uow(self) -> FakeUoW:
+        return self.uow_for_shard(0)
+
+
+@pytest.fixture
+def router() -> FakeShardRouter:
+    return FakeShardRouter()
+
+
+@pytest.fixture
+def service(router: FakeShardRouter):
+    hasher = PasswordHasher(n=2**4, max_workers=2)
+    yield AuthService(router, hasher, JWTHandler(secret_key="test-secret"))
+    hasher.shutdown()
+
+
+def registration(email: str, username: str) -> UserRegister:
+    return UserRegister(email=email, username=username, password="password123")
+
+
+def test_concurrent_registrations_with_same_email_admit_one(service):
+    async def scenario():
+        return await asyncio.gather(
+            *(
+                service.register(registration("a@example.com", f"user{index}"))
+                for index in range(5)
+            ),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(scenario())
+
+    assert sum(isinstance(result, UserRead) for result in results) == 1
+    assert sum(isinstance(result, AlreadyExists) for result in results) == 4
+
+
+def test_login_reads_credentials_from_user_shard(service, router):
+    async def scenario():
+        user = await service.register(registration("a@example.com", "alice"))
+        token = await service.login(
+            UserLogin(email="a@example.com", password="password123")
+        )
+        return user, token
+
+    user, token = asyncio.run(scenario())
+
+    shard = router.shards[router.shard_for(user.uuid)]
+    assert user.uuid in shard.users
+    assert service.jwt_handler.decode_token(token.access_token)["uuid"] == str(
+        user.uuid
+    )
+
+
+@pytest.mark.parametrize(
+    "email, password",
+    [("a@example.com", "wrong-password"), ("b@example.com", "password123")],
+)
+def test_login_rejects_wrong_credentials(service, email, password):
+    async def scenario():
+        await service.register(registration("a@example.com", "alice"))
+        await service.login(UserLogin(email=email, password=password))
+
+    with pytest.raises(IncorrectEmailOrPasswordException):
+        asyncio.run(scenario())
+
+
+def test_failed_registration_releases_login(service, router):
+    for shard in router.shards:
+        shard.broken = True
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(service.register(registration("a@example.com", "alice")))
+    assert router.shards[0].directory == {}
+
+    for shard in router.shards:
+        shard.broken = False
+    user = asyncio.run(service.register(registration("a@example.com", "alice")))
+    assert user.email == "a@example.com"
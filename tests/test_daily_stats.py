@@ -0,0 +1,238 @@
+import datetime
+import uuid
+
+from app.core.repositories.sqlalchemy.shards import ShardRouter
+from app.core.repositories.sqlalchemy.uow import UnitOfWork
+from app.habit_tracker.entity.habits import (
+    HabitDailyStatRead,
+    HabitPeriodStat,
+    HabitRead,
+)
+from app.habit_tracker.service.habits import HabitsService
+from app.habit_tracker.service.write_buffer import PendingIncrement, QuantityWriteBuffer
+
+DAY = datetime.date(2026, 10, 19)
+
+
+async def create_habit(
+    session_maker, target_quantity: float | None = 2000, user_id=None
+) -> HabitRead:
+    """Создаёт количественную привычку (и пользователя, если не передан)."""
+    uow = UnitOfWork(session_maker)
+    async with uow:
+        if user_id is None:
+            user_id = uuid.uuid4()
+            await uow.users.add_one_nr(
+                {
+                    "uuid": user_id,
+                    "username": f"user-{user_id}",
+                    "email": f"{user_id}@example.com",
+                    "hashed_password": "x",
+                }
+            )
+        habit = await uow.habits.add_one(
+            {
+                "user_id": user_id,
+                "name": "Вода",
+                "is_quantifiable": True,
+                "target_quantity": target_quantity,
+                "unit": "мл",
+            }
+        )
+        await uow.commit()
+    return habit
+
+
+async def increment(session_maker, habit: HabitRead, day, quantity, completed=False):
+    uow = UnitOfWork(session_maker)
+    async with uow:
+        await uow.habit_daily_stats.increment(
+            habit=habit, day=day, is_completed=completed, quantity=quantity
+        )
+        await uow.commit()
+
+
+async def find_day(session_maker, habit: HabitRead, day):
+    uow = UnitOfWork(session_maker)
+    async with uow:
+        (stat,) = await uow.habit_daily_stats.find_days(habit_id=habit.uuid, days=[day])
+    return stat
+
+
+def test_repeated_increment_upserts_day_among_other_rows(db):
+    async def scenario(session_maker):
+        habit = await create_habit(session_maker)
+        other = await create_habit(session_maker, user_id=habit.user_id)
+        await increment(session_maker, other, DAY, 100)
+        await increment(session_maker, habit, DAY - datetime.timedelta(days=1), 100)
+        await increment(session_maker, habit, DAY, 1500)
+        await increment(session_maker, habit, DAY, 700)
+        return await find_day(session_maker, habit, DAY)
+
+    stat = db(scenario)
+
+    assert stat.quantity_sum == 2200
+    assert stat.logs_count == 2
+    assert stat.target_hit
+    assert not stat.is_completed
+
+
+def test_buffered_flushes_upsert_same_day(db):
+    async def scenario(session_maker):
+        habit = await create_habit(session_maker)
+        other = await create_habit(session_maker, user_id=habit.user_id)
+        await increment(session_maker, other, DAY, 100)
+        router = ShardRouter([session_maker.kw["bind"]])
+        buffer = QuantityWriteBuffer(router)
+        moment = datetime.datetime(2026, 10, 19, 12, tzinfo=datetime.UTC)
+        for quantity in (1500, 700):
+            buffer.add(habit, DAY, moment, quantity)
+            await buffer.flush()
+        return buffer, await find_day(session_maker, habit, DAY)
+
+    buffer, stat = db(scenario)
+
+    assert not buffer._pending and not buffer._flushing
+    assert (stat.quantity_sum, stat.logs_count, stat.target_hit) == (2200, 2, True)
+
+
+async def add_logs(session_maker, habit: HabitRead, quantities_by_day):
+    uow = UnitOfWork(session_maker)
+    async with uow:
+        for day, quantities in quantities_by_day.items():
+            for quantity in quantities:
+                await uow.habit_logs.add_one(
+                    {"habit_id": habit.uuid, "local_day": day, "quantity": quantity}
+                )
+        await uow.commit()
+
+
+def test_rebuild_days_recomputes_only_requested_days(db):
+    previous = DAY - datetime.timedelta(days=1)
+
+    async def scenario(session_maker):
+        habit = await create_habit(session_maker)
+        await add_logs(session_maker, habit, {DAY: [1500, 300], previous: [400]})
+        await increment(session_maker, habit, DAY, 9999)
+        await increment(session_maker, habit, previous, 50)
+        uow = UnitOfWork(session_maker)
+        async with uow:
+            await uow.habit_daily_stats.rebuild_days(habit_id=habit.uuid, days=[DAY])
+            await uow.commit()
+            return await uow.habit_daily_stats.find_days(
+                habit_id=habit.uuid, days=[previous, DAY]
+            )
+
+    stale, rebuilt = sorted(db(scenario), key=lambda stat: stat.day)
+
+    assert (rebuilt.quantity_sum, rebuilt.logs_count, rebuilt.target_hit) == (
+        1800,
+        2,
+        False,
+    )
+    assert (stale.quantity_sum, stale.logs_count) == (50, 1)
+
+
+def test_rebuild_for_users_leaves_other_users_alone(db):
+    async def scenario(session_maker):
+        habit = await create_habit(session_maker)
+        stranger = await create_habit(session_maker)
+        await add_logs(session_maker, habit, {DAY: [1500, 700]})
+        await increment(session_maker, stranger, DAY, 100)
+        uow = UnitOfWork(session_maker)
+        async with uow:
+            await uow.habit_daily_stats.rebuild_for_users([habit.user_id])
+            await uow.commit()
+            (own,) = await uow.habit_daily_stats.find_days(
+                habit_id=habit.uuid, days=[DAY]
+            )
+            (other,) = await uow.habit_daily_stats.find_days(
+                habit_id=stranger.uuid, days=[DAY]
+            )
+        return own, other
+
+    own, other = db(scenario)
+
+    assert (own.quantity_sum, own.logs_count, own.target_hit) == (2200, 2, True)
+    assert (other.quantity_sum, other.logs_count) == (100, 1)
+
+
+def test_aggregate_rolls_days_up_to_weeks(db):
+    next_monday = DAY + datetime.timedelta(days=7)
+
+    async def scenario(session_maker):
+        habit = await create_habit(session_maker)
+        await increment(session_maker, habit, DAY, 2500)
+        await increment(session_maker, habit, DAY + datetime.timedelta(days=6), 100)
+        await increment(session_maker, habit, next_monday, 2000)
+        uow = UnitOfWork(session_maker)
+        async with uow:
+            return [
+                await uow.habit_daily_stats.aggregate(
+                    habit_id=habit.uuid,
+                    period=period,
+                    date_from=DAY,
+                    date_to=next_monday,
+                )
+                for period in ("week", "day")
+            ]
+
+    weeks, days = db(scenario)
+
+    assert [
+        (week.period_start, week.quantity_sum, week.logs_count, week.target_hit_days)
+        for week in weeks
+    ] == [(DAY, 2600, 2, 1), (next_monday, 2000, 1, 1)]
+    assert len(days) == 3
+
+
+def test_merge_pending_stats_buckets_by_iso_week():
+    habit = HabitRead(
+        uuid=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        name="Вода",
+        description=None,
+        is_quantifiable=True,
+        target_quantity=2000,
+        unit="мл",
+        created_at=datetime.datetime(2026, 10, 1),
+        updated_at=datetime.datetime(2026, 10, 1),
+    )
+    wednesday = DAY + datetime.timedelta(days=2)
+    sunday = DAY + datetime.timedelta(days=6)
+    next_monday = DAY + datetime.timedelta(days=7)
+    stored = HabitPeriodStat(
+        period_start=DAY,
+        completed_days=0,
+        target_hit_days=0,
+        quantity_sum=1500,
+        logs_count=1,
+    )
+    day = HabitDailyStatRead(
+        habit_id=habit.uuid,
+        day=wednesday,
+        is_completed=False,
+        quantity_sum=1500,
+        logs_count=1,
+        target_hit=False,
+    )
+    moment = datetime.datetime(2026, 10, 21, 12, tzinfo=datetime.UTC)
+    pending = [
+        PendingIncrement(habit, local_day, moment, quantity)
+        for local_day, quantity in (
+            (wednesday, 300),
+            (wednesday, 300),
+            (sunday, 100),
+            (next_monday, 2000),
+        )
+    ]
+
+    merged = HabitsService._merge_pending_stats(
+        habit, "week", [stored], [day], pending
+    )
+
+    assert [
+        (stat.period_start, stat.quantity_sum, stat.logs_count, stat.target_hit_days)
+        for stat in merged
+    ] == [(DAY, 2200, 4, 1), (next_monday, 2000, 1, 1)]
+    assert stored.quantity_sum == 1500
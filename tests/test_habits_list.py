@@ -0,0 +1,95 @@
+import datetime
+
+from sqlalchemy import event
+
+from app.core.repositories.sqlalchemy.uow import UnitOfWork
+from app.habit_tracker.repositories.sqlalchemy.models import utc_now
+from app.habit_tracker.service.habits import HabitsService
+from app.habit_tracker.service.utils import to_local_day
+from tests.test_daily_stats import create_habit
+
+
+async def list_version(session_maker, user_id):
+    uow = UnitOfWork(session_maker)
+    async with uow:
+        return await uow.habits.get_list_version(user_id)
+
+
+def test_deleting_older_habit_moves_last_modified(db):
+    async def scenario(session_maker):
+        older = await create_habit(session_maker)
+        await create_habit(session_maker, user_id=older.user_id)
+        before = await list_version(session_maker, older.user_id)
+        uow = UnitOfWork(session_maker)
+        async with uow:
+            await uow.habits.delete_with_id(older.uuid)
+            await uow.commit()
+        return before, await list_version(session_maker, older.user_id)
+
+    (count_before, modified_before), (count_after, modified_after) = db(scenario)
+
+    assert (count_before, count_after) == (2, 1)
+    assert modified_after > modified_before
+
+
+def test_pages_follow_creation_order(db):
+    async def scenario(session_maker):
+        first = await create_habit(session_maker)
+        created = [first] + [
+            await create_habit(session_maker, user_id=first.user_id)
+            for _ in range(3)
+        ]
+        uow = UnitOfWork(session_maker)
+        pages = []
+        async with uow:
+            for page in range(1, 5):
+                _, items = await uow.habits.find_all_pg(
+                    {"user_id": first.user_id}, limit=1, page=page
+                )
+                pages.extend(items)
+        return created, pages
+
+    created, pages = db(scenario)
+
+    assert [habit.uuid for habit in pages] == [habit.uuid for habit in created]
+
+
+def test_recent_logs_use_two_queries_and_user_timezone(db):
+    async def scenario(session_maker):
+        habit = await create_habit(session_maker)
+        today = to_local_day(utc_now(), "Asia/Tokyo")
+        uow = UnitOfWork(session_maker)
+        async with uow:
+            await uow.users.edit_one(habit.user_id, {"timezone": "Asia/Tokyo"})
+            for shift in (0, 2, 3):
+                await uow.habit_logs.add_one(
+                    {
+                        "habit_id": habit.uuid,
+                        "local_day": today - datetime.timedelta(days=shift),
+                        "quantity": shift,
+                    }
+                )
+            await uow.commit()
+
+        statements = []
+        engine = session_maker.kw["bind"].sync_engine
+
+        def listener(connection, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            service = HabitsService(UnitOfWork(session_maker))
+            habits = await service.list_habits_with_recent_logs(habit.user_id, days=3)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        return today, habits, statements
+
+    today, habits, statements = db(scenario)
+
+    assert len([sql for sql in statements if sql.lstrip().startswith("SELECT")]) == 2
+    (habit,) = habits
+    assert sorted(log.local_day for log in habit.logs) == [
+        today - datetime.timedelta(days=2),
+        today,
+    ]
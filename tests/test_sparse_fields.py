@@ -0,0 +1,69 @@
+import uuid
+
+import pytest
+
+from app.core.exc import BadRequestException
+from app.core.repositories.sqlalchemy.uow import UnitOfWork
+from app.habit_tracker.entity.habits import HabitRead
+from app.habit_tracker.repositories.sqlalchemy.repositories import HabitsRepository
+from tests.test_daily_stats import create_habit
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return iter(self.rows)
+
+
+@pytest.fixture
+def repository():
+    return HabitsRepository(session=None)
+
+
+def test_normalize_fields_orders_as_schema_and_skips_empty_names(repository):
+    assert repository.normalize_fields(["name", "", " uuid ", ""]) == ("uuid", "name")
+    assert repository.normalize_fields(["", " "]) is None
+    assert repository.normalize_fields(None) is None
+
+
+def test_normalize_fields_rejects_unknown_columns(repository):
+    with pytest.raises(BadRequestException):
+        repository.normalize_fields(["uuid", "logs"])
+
+
+def test_partial_schema_is_cached_per_field_set(repository):
+    schema = repository.partial_schema(("uuid", "name"))
+
+    assert schema is repository.partial_schema(("uuid", "name"))
+    assert schema is not repository.partial_schema(("uuid",))
+    assert list(schema.model_fields) == ["uuid", "name"]
+    for name, field in schema.model_fields.items():
+        assert field.annotation == HabitRead.model_fields[name].annotation
+
+
+def test_to_read_models_validates_rows_with_partial_schema(repository):
+    habit_id = uuid.uuid4()
+    result = FakeResult([{"uuid": habit_id, "name": "Вода"}])
+
+    (item,) = repository.to_read_models(result, ("uuid", "name"))
+
+    assert item.model_dump() == {"uuid": habit_id, "name": "Вода"}
+
+
+def test_find_all_pg_loads_only_requested_columns(db):
+    async def scenario(session_maker):
+        habit = await create_habit(session_maker)
+        uow = UnitOfWork(session_maker)
+        async with uow:
+            return habit, await uow.habits.find_all_pg(
+                {"user_id": habit.user_id}, limit=10, page=1, fields=["name", "uuid"]
+            )
+
+    habit, (total, items) = db(scenario)
+
+    assert total == 1
+    assert [item.model_dump() for item in items] == [
+        {"uuid": habit.uuid, "name": habit.name}
+    ]
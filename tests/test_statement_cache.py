@@ -0,0 +1,108 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.exc import NotFoundError
+from app.habit_tracker.repositories.sqlalchemy.repositories import (
+    HabitLogsRepository,
+    HabitsRepository,
+)
+
+
+class FakeResult:
+    def scalar_one(self):
+        return 0
+
+    def scalar_one_or_none(self):
+        return None
+
+    def scalars(self):
+        return iter(())
+
+    def mappings(self):
+        return iter(())
+
+
+class RecordingSession:
+    """Сессия, запоминающая выполненные шаблоны запросов и их параметры."""
+
+    def __init__(self):
+        self.executed = []
+
+    async def execute(self, stmt, params=None):
+        self.executed.append((stmt, params))
+        return FakeResult()
+
+
+def render(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def find_page(repository, filter_by, fields=None):
+    asyncio.run(repository.find_all_pg(filter_by, limit=10, page=2, fields=fields))
+    stmt, params = repository.session.executed[-1]
+    return stmt, params
+
+
+@pytest.fixture
+def habits():
+    return HabitsRepository(session=RecordingSession())
+
+
+def test_none_filter_renders_is_null(habits):
+    user_id = uuid.uuid4()
+
+    stmt, params = find_page(habits, {"user_id": user_id, "description": None})
+
+    sql = render(stmt)
+    assert "habits.description IS NULL" in sql
+    assert "habits.user_id = %(f_user_id)s" in sql
+    assert "ORDER BY habits.created_at, habits.uuid" in sql
+    assert params == {"f_user_id": user_id, "limit": 10, "offset": 10}
+
+
+def test_same_filter_shape_reuses_statement(habits):
+    first, first_params = find_page(habits, {"user_id": uuid.uuid4()})
+    second, second_params = find_page(habits, {"user_id": uuid.uuid4()})
+
+    assert first is second
+    assert first_params != second_params
+
+
+def test_find_one_reuses_statement_between_repositories():
+    first = HabitsRepository(session=RecordingSession())
+    second = HabitsRepository(session=RecordingSession())
+
+    for repository in (first, second):
+        with pytest.raises(NotFoundError):
+            asyncio.run(repository.find_one({"uuid": uuid.uuid4()}))
+
+    assert first.session.executed[0][0] is second.session.executed[0][0]
+
+
+def test_different_shapes_do_not_collide(habits):
+    user_id = uuid.uuid4()
+    by_value, _ = find_page(habits, {"user_id": user_id})
+    by_null, _ = find_page(habits, {"user_id": None})
+    two_keys, _ = find_page(habits, {"user_id": user_id, "name": "Вода"})
+    sparse, _ = find_page(habits, {"user_id": user_id}, fields=["uuid"])
+
+    statements = [by_value, by_null, two_keys, sparse]
+    assert len({id(stmt) for stmt in statements}) == len(statements)
+    assert "habits.user_id IS NULL" in render(by_null)
+    assert "habits.name = %(f_name)s" in render(two_keys)
+    assert render(sparse).startswith("SELECT habits.uuid \nFROM habits")
+
+
+def test_different_models_do_not_collide(habits):
+    logs = HabitLogsRepository(session=RecordingSession())
+    filter_by = {"uuid": uuid.uuid4()}
+
+    habits_stmt, _ = find_page(habits, filter_by)
+    logs_stmt, _ = find_page(logs, filter_by)
+
+    assert habits_stmt is not logs_stmt
+    assert "FROM habits " in render(habits_stmt)
+    assert "FROM habit_logs " in render(logs_stmt)
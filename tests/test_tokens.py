@@ -0,0 +1,56 @@
+import datetime
+import uuid
+
+import jwt
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.exc import IncorrectTokenFormatException, TokenExpiredException
+from app.core.settings import settings
+from app.core.utils import JWTHandler
+from app.habit_tracker.api.deps import get_token, get_user_id
+
+
+def bearer(token: str) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+def test_issued_token_resolves_user():
+    user_id = uuid.uuid4()
+    token = JWTHandler(secret_key=settings.secret_key).create_token(
+        {"uuid": str(user_id)}
+    )
+
+    assert get_user_id(get_token(bearer(token))) == user_id
+
+
+def test_token_signed_with_other_key_is_rejected():
+    token = JWTHandler(secret_key="other-key").create_token({"uuid": str(uuid.uuid4())})
+
+    with pytest.raises(IncorrectTokenFormatException):
+        get_token(bearer(token))
+
+
+def test_expired_token_is_rejected():
+    token = jwt.encode(
+        {"uuid": str(uuid.uuid4()), "exp": datetime.datetime(2000, 1, 1)},
+        settings.secret_key,
+        algorithm="HS256",
+    )
+
+    with pytest.raises(TokenExpiredException):
+        get_token(bearer(token))
+
+
+def test_token_without_expiration_is_rejected():
+    token = jwt.encode(
+        {"uuid": str(uuid.uuid4())}, settings.secret_key, algorithm="HS256"
+    )
+
+    with pytest.raises(IncorrectTokenFormatException):
+        get_token(bearer(token))
+
+
+def test_malformed_token_is_rejected():
+    with pytest.raises(IncorrectTokenFormatException):
+        get_token(bearer("not-a-token"))
@@ -0,0 +1,76 @@
+import datetime
+from email.utils import format_datetime
+
+from app.core.utils import Validators
+
+MODIFIED = datetime.datetime(2026, 10, 19, 12, 30, 15, 250000, tzinfo=datetime.UTC)
+
+
+def http_date(value: datetime.datetime) -> str:
+    return format_datetime(value, usegmt=True)
+
+
+def test_etag_depends_on_version_and_request_parts():
+    base = Validators.from_version(3, MODIFIED, 20, 1)
+
+    assert base.etag.startswith('W/"')
+    assert base == Validators.from_version(3, MODIFIED, 20, 1)
+    assert base.etag != Validators.from_version(2, MODIFIED, 20, 1).etag
+    assert base.etag != Validators.from_version(3, MODIFIED, 20, 2).etag
+    later = MODIFIED + datetime.timedelta(seconds=1)
+    assert base.etag != Validators.from_version(3, later, 20, 1).etag
+
+
+def test_naive_last_modified_is_treated_as_utc():
+    naive = Validators.from_version(1, MODIFIED.replace(tzinfo=None))
+
+    assert naive.last_modified == MODIFIED
+    assert naive.headers["Last-Modified"] == "Mon, 19 Oct 2026 12:30:15 GMT"
+
+
+def test_if_none_match_accepts_weak_and_strong_forms():
+    validators = Validators.from_version(1, MODIFIED)
+    strong = validators.etag.removeprefix("W/")
+
+    assert validators.is_not_modified(validators.etag, None)
+    assert validators.is_not_modified(strong, None)
+    assert validators.is_not_modified(f'"other", {validators.etag}', None)
+    assert not validators.is_not_modified('"other"', None)
+
+
+def test_if_none_match_star_matches_any_representation():
+    assert Validators.from_version(0, None).is_not_modified("*", None)
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    validators = Validators.from_version(1, MODIFIED)
+    fresh = http_date(MODIFIED + datetime.timedelta(hours=1))
+
+    assert not validators.is_not_modified('"stale"', fresh)
+    stale = http_date(MODIFIED - datetime.timedelta(hours=1))
+    assert validators.is_not_modified(validators.etag, stale)
+
+
+def test_if_modified_since_compares_with_second_precision():
+    validators = Validators.from_version(1, MODIFIED)
+
+    assert validators.is_not_modified(None, http_date(MODIFIED))
+    assert validators.is_not_modified(
+        None, http_date(MODIFIED + datetime.timedelta(minutes=1))
+    )
+    assert not validators.is_not_modified(
+        None, http_date(MODIFIED - datetime.timedelta(seconds=1))
+    )
+    assert not validators.is_not_modified(None, "not a date")
+    empty = Validators.from_version(0, None)
+    assert not empty.is_not_modified(None, http_date(MODIFIED))
+
+
+def test_deletion_invalidates_if_modified_since():
+    before = Validators.from_version(2, MODIFIED)
+    deleted_at = MODIFIED + datetime.timedelta(seconds=5)
+    after = Validators.from_version(1, deleted_at)
+
+    assert before.is_not_modified(None, before.headers["Last-Modified"])
+    assert not after.is_not_modified(None, before.headers["Last-Modified"])
+    assert not after.is_not_modified(before.etag, None)
@@ -0,0 +1,325 @@
+import asyncio
+import datetime
+import uuid
+from typing import List, Optional
+
+from app.core.exc import NotFoundError
+from app.core.logger import logger
+from app.habit_tracker.entity.habits import HabitRead
+from app.habit_tracker.service.write_buffer import QuantityWriteBuffer
+
+DAY = datetime.date(2026, 10, 19)
+MOMENT = datetime.datetime(2026, 10, 19, 12, tzinfo=datetime.UTC)
+
+
+class FakeDB:
+    """Хранилище записанных строк с управляемыми сбоями."""
+
+    def __init__(self):
+        self.logs: List[dict] = []
+        self.stats: list = []
+        self.deleted_habits: set = set()
+        self.transient_failures = 0
+        self.gate: Optional[asyncio.Event] = None
+        self.writing = asyncio.Event()
+        self.close_gate: Optional[asyncio.Event] = None
+        self.closing = asyncio.Event()
+
+
+class FakeLogs:
+    def __init__(self, uow: "FakeUoW"):
+        self.uow = uow
+
+    async def add_many(self, rows: List[dict]) -> bool:
+        db = self.uow.db
+        db.writing.set()
+        if db.gate is not None:
+            await db.gate.wait()
+        if db.transient_failures:
+            db.transient_failures -= 1
+            raise ConnectionError("connection lost")
+        if any(row["habit_id"] in db.deleted_habits for row in rows):
+            raise NotFoundError("Связанный объект не найден.")
+        self.uow.staged_logs.extend(rows)
+        return True
+
+
+class FakeStats:
+    def __init__(self, uow: "FakeUoW"):
+        self.uow = uow
+
+    async def increment_many(self, items: list) -> None:
+        self.uow.staged_stats.extend(items)
+
+
+class FakeUoW:
+    def __init__(self, db: FakeDB):
+        self.db = db
+        self.staged_logs: List[dict] = []
+        self.staged_stats: list = []
+        self.habit_logs = FakeLogs(self)
+        self.habit_daily_stats = FakeStats(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.staged_logs, self.staged_stats = [], []
+        if self.db.close_gate is not None:
+            self.db.closing.set()
+            await self.db.close_gate.wait()
+
+    async def commit(self):
+        self.db.logs.extend(self.staged_logs)
+        self.db.stats.extend(self.staged_stats)
+        self.staged_logs, self.staged_stats = [], []
+
+
+class FakeShardRouter:
+    def __init__(self, db: FakeDB):
+        self.db = db
+
+    def shard_for(self, user_id: uuid.UUID) -> int:
+        return 0
+
+    def uow_for_shard(self, shard: int) -> FakeUoW:
+        return FakeUoW(self.db)
+
+
+def make_habit() -> HabitRead:
+    return HabitRead(
+        uuid=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        name="Вода",
+        description=None,
+        is_quantifiable=True,
+        target_quantity=2000,
+        unit="мл",
+        created_at=MOMENT,
+        updated_at=MOMENT,
+    )
+
+
+def make_buffer(db: FakeDB, **kwargs) -> QuantityWriteBuffer:
+    return QuantityWriteBuffer(FakeShardRouter(db), **kwargs)
+
+
+def test_increments_coalesce_into_one_log():
+    async def scenario():
+        db = FakeDB()
+        buffer = make_buffer(db)
+        habit = make_habit()
+        first = buffer.add(habit, DAY, MOMENT, 250)
+        second = buffer.add(habit, DAY, MOMENT + datetime.timedelta(hours=1), 300)
+        await buffer.flush()
+        return db, habit, first, second
+
+    db, habit, first, second = asyncio.run(scenario())
+
+    assert (first.quantity, second.quantity) == (250, 300)
+    assert first.uuid == second.uuid
+    assert len(db.logs) == 1
+    assert db.logs[0]["uuid"] == first.uuid
+    assert db.logs[0]["quantity"] == 550
+    assert db.logs[0]["date"] == MOMENT + datetime.timedelta(hours=1)
+    assert len(db.stats) == 1 and db.stats[0].habit == habit
+
+
+def test_transient_failure_requeues_and_merges_new_increments():
+    async def scenario():
+        db = FakeDB()
+        db.transient_failures = 1
+        buffer = make_buffer(db)
+        habit = make_habit()
+        buffer.add(habit, DAY, MOMENT, 100)
+        await buffer.flush()
+        requeued = [item.quantity for item in buffer.pending_for(habit.uuid)]
+        buffer.add(habit, DAY, MOMENT, 50)
+        await buffer.flush()
+        return db, buffer, requeued
+
+    db, buffer, requeued = asyncio.run(scenario())
+
+    assert requeued == [100]
+    assert [row["quantity"] for row in db.logs] == [150]
+    assert not buffer._pending and not buffer._flushing
+
+
+def test_increment_dropped_after_max_attempts():
+    async def scenario():
+        db = FakeDB()
+        db.transient_failures = 10
+        buffer = make_buffer(db, max_attempts=3)
+        buffer.add(make_habit(), DAY, MOMENT, 100)
+        for _ in range(3):
+            await buffer.flush()
+        return db, buffer
+
+    db, buffer = asyncio.run(scenario())
+
+    assert db.logs == []
+    assert not buffer._pending and not buffer._flushing
+
+
+def test_rejected_increment_does_not_block_others():
+    async def scenario():
+        db = FakeDB()
+        buffer = make_buffer(db)
+        deleted, alive = make_habit(), make_habit()
+        db.deleted_habits.add(deleted.uuid)
+        buffer.add(deleted, DAY, MOMENT, 100)
+        buffer.add(alive, DAY, MOMENT, 200)
+        await buffer.flush()
+        return db, buffer, alive
+
+    db, buffer, alive = asyncio.run(scenario())
+
+    assert [(row["habit_id"], row["quantity"]) for row in db.logs] == [
+        (alive.uuid, 200)
+    ]
+    assert not buffer._pending and not buffer._flushing
+
+
+def test_buffer_refuses_new_keys_when_full():
+    buffer = make_buffer(FakeDB(), max_pending=1)
+    habit = make_habit()
+    buffer.add(habit, DAY, MOMENT, 100)
+
+    assert buffer.has_room(habit.uuid, DAY)
+    assert not buffer.has_room(habit.uuid, DAY + datetime.timedelta(days=1))
+    assert not buffer.has_room(uuid.uuid4(), DAY)
+
+
+def test_stop_waits_for_flush_in_progress():
+    async def scenario():
+        db = FakeDB()
+        db.gate = asyncio.Event()
+        buffer = make_buffer(db, max_items=1, flush_interval_ms=60_000)
+        buffer.start()
+        buffer.add(make_habit(), DAY, MOMENT, 100)
+        await db.writing.wait()
+        stopping = asyncio.create_task(buffer.stop())
+        await asyncio.sleep(0)
+        db.gate.set()
+        await stopping
+        return db, buffer
+
+    db, buffer = asyncio.run(scenario())
+
+    assert [row["quantity"] for row in db.logs] == [100]
+    assert not buffer._pending and not buffer._flushing
+
+
+def test_stop_flushes_remaining_increments():
+    async def scenario():
+        db = FakeDB()
+        buffer = make_buffer(db, flush_interval_ms=60_000)
+        buffer.start()
+        buffer.add(make_habit(), DAY, MOMENT, 100)
+        await buffer.stop()
+        return db
+
+    db = asyncio.run(scenario())
+
+    assert [row["quantity"] for row in db.logs] == [100]
+
+
+def test_discard_drops_pending_increments_of_habit():
+    async def scenario():
+        db = FakeDB()
+        buffer = make_buffer(db)
+        deleted, alive = make_habit(), make_habit()
+        buffer.add(deleted, DAY, MOMENT, 100)
+        buffer.add(alive, DAY, MOMENT, 200)
+        buffer.discard(deleted.uuid)
+        await buffer.flush()
+        return db, alive
+
+    db, alive = asyncio.run(scenario())
+
+    assert [row["habit_id"] for row in db.logs] == [alive.uuid]
+
+
+def test_discard_during_flush_does_not_requeue_increment():
+    async def scenario():
+        db = FakeDB()
+        db.gate = asyncio.Event()
+        db.transient_failures = 1
+        buffer = make_buffer(db)
+        habit = make_habit()
+        buffer.add(habit, DAY, MOMENT, 100)
+        flushing = asyncio.create_task(buffer.flush())
+        await db.writing.wait()
+        buffer.discard(habit.uuid)
+        in_flight = buffer.pending_for(habit.uuid)
+        db.gate.set()
+        await flushing
+        return buffer, in_flight
+
+    buffer, in_flight = asyncio.run(scenario())
+
+    assert in_flight == []
+    assert not buffer._pending and not buffer._flushing
+
+
+def test_committed_increment_leaves_flushing_before_session_closes():
+    async def scenario():
+        db = FakeDB()
+        db.close_gate = asyncio.Event()
+        buffer = make_buffer(db)
+        habit = make_habit()
+        buffer.add(habit, DAY, MOMENT, 100)
+        flushing = asyncio.create_task(buffer.flush())
+        await db.closing.wait()
+        visible = (len(db.logs), buffer.pending_for(habit.uuid))
+        db.close_gate.set()
+        await flushing
+        return visible
+
+    committed, pending = asyncio.run(scenario())
+
+    assert committed == 1
+    assert pending == []
+
+
+def test_cancel_after_commit_does_not_requeue():
+    async def scenario():
+        db = FakeDB()
+        db.close_gate = asyncio.Event()
+        buffer = make_buffer(db)
+        buffer.add(make_habit(), DAY, MOMENT, 100)
+        flushing = asyncio.create_task(buffer.flush())
+        await db.closing.wait()
+        flushing.cancel()
+        try:
+            await flushing
+        except asyncio.CancelledError:
+            pass
+        return db, buffer
+
+    db, buffer = asyncio.run(scenario())
+
+    assert [row["quantity"] for row in db.logs] == [100]
+    assert not buffer._pending and not buffer._flushing
+
+
+def test_dropped_increment_is_logged_with_key():
+    messages: List[str] = []
+    sink = logger.add(messages.append, format="{message}")
+    try:
+
+        async def scenario():
+            db = FakeDB()
+            db.transient_failures = 10
+            buffer = make_buffer(db, max_attempts=1)
+            habit = make_habit()
+            buffer.add(habit, DAY, MOMENT, 100)
+            await buffer.flush()
+            return habit
+
+        habit = asyncio.run(scenario())
+    finally:
+        logger.remove(sink)
+
+    dropped = [message for message in messages if "after 1 attempts" in message]
+    assert len(dropped) == 1 and str(habit.uuid) in dropped[0]